@@ -0,0 +1,59 @@
+# -*- coding:utf-8 -*-
+
+'''
+    分块消元的扩展性基准测试：同一个随机稠密方程组分别用 1、2、4、8 个 worker 求解，
+    报告耗时、相对单 worker 的加速比，并检查各次结果逐位一致。
+
+        python benchmarks/blocked_elimination.py [--size N] [--block-size B] [--executor process|thread]
+'''
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linear_algebra.blocked_elimination import BlockedEliminator
+
+
+def random_system(n, seed):
+    rng = random.Random(seed)
+    coefficients = [[rng.uniform(-1, 1) for _ in range(n)] for _ in range(n)]
+    constants = [rng.uniform(-1, 1) for _ in range(n)]
+    return coefficients, constants
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Blocked elimination scaling benchmark')
+    parser.add_argument('--size', type=int, default=480)
+    parser.add_argument('--block-size', type=int, default=48)
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    coefficients, constants = random_system(args.size, args.seed)
+    print('n = {}, block_size = {}, executor = {}, cpus = {}'.format(
+        args.size, args.block_size, args.executor, os.cpu_count()))
+    print('{:>8} {:>10} {:>9} {:>12}'.format('workers', 'time (s)', 'speedup', 'identical'))
+
+    baseline_time, baseline_solution = None, None
+    for workers in args.workers:
+        with BlockedEliminator(workers=workers, block_size=args.block_size,
+                               executor=args.executor) as eliminator:
+            # 预热：进程池启动不计入耗时
+            eliminator.solve_arrays(*random_system(2 * args.block_size + 1, args.seed + 1))
+            start = time.perf_counter()
+            solution = eliminator.solve_arrays(coefficients, constants)
+            elapsed = time.perf_counter() - start
+
+        if baseline_time is None:
+            baseline_time, baseline_solution = elapsed, solution
+        print('{:>8} {:>10.3f} {:>9.2f} {:>12}'.format(
+            workers, elapsed, baseline_time / elapsed, str(solution == baseline_solution)))
+
+
+if __name__ == '__main__':
+    main()
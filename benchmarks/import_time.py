@@ -0,0 +1,63 @@
+# -*- coding:utf-8 -*-
+
+'''
+    导入耗时基准测试。每个场景都在新的解释器进程中运行，
+    测量执行导入语句所需的时间，并列出实际加载的 linear_algebra 子模块。
+
+        python benchmarks/import_time.py [--repeat N]
+'''
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = [
+    ('package only', 'import linear_algebra'),
+    ('Vector', 'import linear_algebra; linear_algebra.Vector'),
+    ('LinearSystem', 'import linear_algebra; linear_algebra.LinearSystem'),
+    ('Matrix', 'import linear_algebra; linear_algebra.Matrix'),
+    ('SolverService', 'import linear_algebra; linear_algebra.SolverService'),
+]
+
+# 在子进程中执行：计时导入语句，输出耗时 (us) 和已加载的子模块
+TEMPLATE = '''
+import sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+modules = sorted(m for m in sys.modules if m.startswith('linear_algebra.'))
+print(int(elapsed * 1e6))
+print(','.join(m.split('.', 1)[1] for m in modules))
+'''
+
+
+def measure(code):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, '-c', TEMPLATE.format(code=code)],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    elapsed, modules = result.stdout.splitlines()
+    return int(elapsed), modules
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure linear_algebra import time')
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    print('{:<16} {:>12}  {}'.format('scenario', 'median (us)', 'submodules loaded'))
+    for name, code in SCENARIOS:
+        runs = [measure(code) for _ in range(args.repeat)]
+        elapsed = median([r[0] for r in runs])
+        print('{:<16} {:>12}  {}'.format(name, elapsed, runs[-1][1] or '-'))
+
+
+if __name__ == '__main__':
+    main()
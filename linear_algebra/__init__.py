@@ -0,0 +1,54 @@
+# -*- coding:utf-8 -*-
+
+'''
+    线性代数工具包：向量、直线、平面、线性方程组与矩阵。
+
+    子模块按需导入：访问 linear_algebra.Matrix 时才会加载 matrix 模块，
+    asyncio 求解服务、NumPy 等可选部分不会拖慢 import linear_algebra。
+    导入本包不会修改全局的 decimal 上下文，需要更高精度时使用
+    decimal_context()。
+'''
+
+from importlib import import_module
+
+_LAZY_ATTRIBUTES = {
+    'Vector': 'vector',
+    'DECIMAL_PRECISION': 'vector',
+    'decimal_context': 'vector',
+    'Line': 'line',
+    'Plane': 'plane',
+    'LinearSystem': 'linsys',
+    'BlockedEliminator': 'blocked_elimination',
+    'SolveCache': 'solve_cache',
+    'Matrix': 'matrix',
+    'VectorArray': 'vector_array',
+    'HyperplaneIndex': 'hyperplane_index',
+    'half_plane_intersection': 'half_plane',
+    'Segment': 'segment',
+    'segment_intersections': 'segment',
+    'PlaneFitter': 'plane_fit',
+    'RansacPlaneFitter': 'plane_fit',
+    'power_iteration': 'eigen',
+    'lanczos': 'eigen',
+    'jacobi_eigen': 'eigen',
+    'covariance_matrix': 'eigen',
+    'SolverService': 'service',
+    'LocalClient': 'service',
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    value = getattr(import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,245 @@
+# -*- coding:utf-8 -*-
+
+'''
+    大型稠密方程组的分块右视 (right-looking) 高斯消元，可在多个 worker 上并行。
+
+    增广矩阵 [A | b] 以 float64 行优先存放在共享内存中。每处理完一个
+    block_size 列宽的面板 (panel)：
+      1. 主进程对面板做部分主元消元，并把行交换施加到整行；
+      2. 主进程求出面板行在面板右侧的部分 U12；
+      3. 右下角剩余子矩阵的更新 A22 -= L21 * U12 被切成 tile，
+         交给线程池或进程池并行计算，各 tile 写入互不重叠的区域。
+    每个元素的更新都按相同的顺序累加，因此在 block_size 相同时，结果与 worker 数量无关。
+'''
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+from .vector import Vector
+from .linsys import LinearSystem
+
+# tile 更新：对 rows x cols 中的每个元素 a[i][j] -= sum_k a[i][k] * a[k][j]，k 取面板列
+def _update_tile(a, width, k0, k1, rows, cols):
+    r0, r1 = rows
+    c0, c1 = cols
+    panel = range(k0, k1)
+    u_rows = [a[k*width + c0:k*width + c1].tolist() for k in panel]
+
+    for i in range(r0, r1):
+        base = i * width
+        multipliers = a[base + k0:base + k1].tolist()
+        row = a[base + c0:base + c1].tolist()
+        for l_ik, u_row in zip(multipliers, u_rows):
+            if l_ik == 0.0:
+                continue
+            for j in range(len(row)):
+                row[j] -= l_ik * u_row[j]
+        a[base + c0:base + c1] = array('d', row)
+
+
+# 在 worker 进程中执行：按名字连接共享内存，完成分到的一组 tile 后立即断开，
+# 各次求解互不影响，求解结束后 worker 也不会继续映射已删除的共享内存
+def _update_tiles_shared(name, width, k0, k1, tiles):
+    shm = shared_memory.SharedMemory(name=name)
+    a = shm.buf.cast('d')
+    try:
+        for rows, cols in tiles:
+            _update_tile(a, width, k0, k1, rows, cols)
+    finally:
+        a.release()
+        shm.close()
+
+
+class BlockedEliminator(object):
+    '''
+        workers:    并行 worker 数，1 表示在主进程内顺序执行
+        block_size: 面板宽度，也是剩余子矩阵 tile 的边长
+        executor:   'process' (默认，可绕过 GIL) 或 'thread'
+    '''
+
+    SINGULAR_MATRIX_MSG = 'Matrix is singular to working precision'
+    SYSTEM_MUST_BE_SQUARE_MSG = 'Blocked elimination needs as many equations as variables'
+
+    def __init__(self, workers=1, block_size=64, executor='process', tolerance=1e-10):
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        if block_size < 1:
+            raise ValueError('block_size must be at least 1')
+        if executor not in ('process', 'thread'):
+            raise ValueError("executor must be 'process' or 'thread'")
+
+        self.workers = workers
+        self.block_size = block_size
+        self.executor = executor
+        self.tolerance = tolerance
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.executor == 'process':
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    # 求解 LinearSystem；矩阵奇异时与 compute_solution 一样，
+    # 抛出“无解”或“无穷多解”的异常
+    def solve(self, system):
+        if len(system) != system.dimension:
+            raise Exception(self.SYSTEM_MUST_BE_SQUARE_MSG)
+
+        coefficients = [[float(x) for x in p.normal_vector.coordinates] for p in system.planes]
+        constants = [float(p.constant_term) for p in system.planes]
+        try:
+            return Vector(self.solve_arrays(coefficients, constants))
+        except Exception as e:
+            if str(e) == self.SINGULAR_MATRIX_MSG:
+                self._raise_singular(coefficients, constants)
+            raise e
+
+    # 奇异时用 float 部分主元消元化为阶梯形 (跳过没有主元的列)，
+    # 据此判断无解还是无穷多解；复杂度与分块消元本身同阶
+    def _raise_singular(self, coefficients, constants):
+        rows = [list(row) + [b] for row, b in zip(coefficients, constants)]
+        n = len(rows)
+        rank = 0
+        for k in range(n):
+            pivot_row = max(range(rank, n), key=lambda i: abs(rows[i][k]))
+            if abs(rows[pivot_row][k]) < self.tolerance:
+                continue
+            rows[rank], rows[pivot_row] = rows[pivot_row], rows[rank]
+
+            pivot = rows[rank]
+            for i in range(rank + 1, n):
+                factor = rows[i][k] / pivot[k]
+                if factor != 0.0:
+                    rows[i] = [x - factor * p for x, p in zip(rows[i], pivot)]
+            rank += 1
+            if rank == n:
+                break
+
+        # 系数全部消为零的方程若常数项不为零，则方程组矛盾
+        if any([abs(row[n]) >= self.tolerance for row in rows[rank:]]):
+            raise Exception(LinearSystem.NO_SOLUTIONS_MSG)
+        raise Exception(LinearSystem.INF_SOLUTIONS_MSG)
+
+    # 直接以 float 行和常数项求解，返回解的坐标列表
+    def solve_arrays(self, coefficients, constants):
+        n = len(coefficients)
+        if n == 0 or len(constants) != n or any([len(row) != n for row in coefficients]):
+            raise Exception(self.SYSTEM_MUST_BE_SQUARE_MSG)
+
+        width = n + 1
+        shm = shared_memory.SharedMemory(create=True, size=8 * n * width)
+        a = shm.buf.cast('d')
+        try:
+            for i in range(n):
+                a[i*width:(i+1)*width] = array('d', list(coefficients[i]) + [constants[i]])
+
+            for k0 in range(0, n, self.block_size):
+                k1 = min(k0 + self.block_size, n)
+                self._factor_panel(a, n, width, k0, k1)
+                self._update_trailing(a, shm.name, n, width, k0, k1)
+
+            return self._back_substitute(a, n, width)
+
+        finally:
+            a.release()
+            shm.close()
+            shm.unlink()
+
+    def _factor_panel(self, a, n, width, k0, k1):
+        for k in range(k0, k1):
+            pivot_row = max(range(k, n), key=lambda i: abs(a[i*width + k]))
+            if abs(a[pivot_row*width + k]) < self.tolerance:
+                raise Exception(self.SINGULAR_MATRIX_MSG)
+
+            if pivot_row != k:
+                row_k = a[k*width:(k+1)*width].tolist()
+                a[k*width:(k+1)*width] = a[pivot_row*width:(pivot_row+1)*width]
+                a[pivot_row*width:(pivot_row+1)*width] = array('d', row_k)
+
+            pivot = a[k*width + k]
+            u_panel = a[k*width + k + 1:k*width + k1].tolist()
+            for i in range(k + 1, n):
+                base = i * width
+                l_ik = a[base + k] / pivot
+                a[base + k] = l_ik
+                if l_ik == 0.0:
+                    continue
+                for j, u_kj in enumerate(u_panel, k + 1):
+                    a[base + j] -= l_ik * u_kj
+
+        # U12 = L11^-1 * A12：对面板行在面板右侧的部分做前代
+        for k in range(k0, k1):
+            u_row = a[k*width + k1:(k+1)*width].tolist()
+            for i in range(k + 1, k1):
+                base = i * width
+                l_ik = a[base + k]
+                if l_ik == 0.0:
+                    continue
+                row = a[base + k1:base + width].tolist()
+                a[base + k1:base + width] = array('d', [x - l_ik * u for x, u in zip(row, u_row)])
+
+    def _update_trailing(self, a, name, n, width, k0, k1):
+        if k1 >= n:
+            return
+
+        tile = self.block_size
+        tiles = [((r, min(r + tile, n)), (c, min(c + tile, width)))
+                 for r in range(k1, n, tile) for c in range(k1, width, tile)]
+
+        # 同一进程内 (单 worker 或线程池) 直接使用 a，不必按名字重新连接
+        if self.workers == 1:
+            for rows, cols in tiles:
+                _update_tile(a, width, k0, k1, rows, cols)
+            return
+
+        pool = self._get_pool()
+        if self.executor == 'thread':
+            futures = [pool.submit(_update_tile, a, width, k0, k1, rows, cols) for rows, cols in tiles]
+        else:
+            # 每个 worker 一组交错分配的 tile，每组只连接一次共享内存
+            futures = [pool.submit(_update_tiles_shared, name, width, k0, k1, tiles[i::self.workers])
+                       for i in range(min(self.workers, len(tiles)))]
+        for future in futures:
+            future.result()
+
+    def _back_substitute(self, a, n, width):
+        x = [0.0] * n
+        for i in range(n)[::-1]:
+            base = i * width
+            s = a[base + n]
+            for j in range(i + 1, n):
+                s -= a[base + j] * x[j]
+            x[i] = s / a[base + i]
+        return x
+
+
+if __name__ == '__main__':
+
+    import random
+    from .plane import Plane
+
+    rng = random.Random(0)
+    n = 120
+    planes = [Plane(Vector([rng.uniform(-1, 1) + (n if i == j else 0) for j in range(n)]),
+                    rng.uniform(-10, 10))
+              for i in range(n)]
+    s = LinearSystem(planes)
+
+    with BlockedEliminator(workers=2, block_size=32) as eliminator:
+        x = eliminator.solve(s)
+    print('x[:3] = {}'.format([round(c, 6) for c in x.coordinates[:3]]))
@@ -0,0 +1,74 @@
+# -*- coding:utf-8 -*-
+
+'''
+    与 NumPy 数组及缓冲区协议 (buffer protocol) 互操作的辅助函数。
+    NumPy 是可选依赖，只在真正需要构造 ndarray 时才导入。
+'''
+
+from array import array
+
+NUMPY_NOT_AVAILABLE_MSG = 'NumPy is required for array interop'
+FLOAT_BUFFER_REQUIRED_MSG = 'A C-contiguous float64 buffer is required'
+COPY_REQUIRED_MSG = 'Decimal coordinates cannot be exposed as an array without copying'
+
+
+def numpy_module():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(NUMPY_NOT_AVAILABLE_MSG)
+    return numpy
+
+
+# 不复制地把对象包装为一维 float64 memoryview，返回 (视图, 形状)
+def float_memoryview(obj):
+    try:
+        view = obj if isinstance(obj, memoryview) else memoryview(obj)
+    except TypeError:
+        raise TypeError(FLOAT_BUFFER_REQUIRED_MSG)
+
+    if view.format not in ('d', '<d', '=d') or not view.c_contiguous:
+        raise TypeError(FLOAT_BUFFER_REQUIRED_MSG)
+
+    shape = view.shape
+    if view.ndim != 1:
+        view = view.cast('B').cast('d')
+    return view, shape
+
+
+# 尝试把缓冲区对象 (ndarray、array.array、memoryview 等) 展开为 Python 数值列表；
+# 不支持缓冲区协议的对象原样返回。
+# 本包自己的类型 (Vector、VectorArray、Matrix) 提供 _tolist，直接取出精确的
+# Decimal 值，而不经由 float64 缓冲区；memoryview 不支持的格式 (float16、
+# 复数等) 退回到 numpy.asarray(obj).tolist()
+def buffer_tolist(obj):
+    tolist = getattr(obj, '_tolist', None)
+    if tolist is not None:
+        return tolist()
+    if not (isinstance(obj, memoryview) or hasattr(obj, '__array__')):
+        return obj
+    try:
+        view = obj if isinstance(obj, memoryview) else memoryview(obj)
+        return view.tolist()
+    except TypeError:
+        return obj
+    except NotImplementedError:
+        if hasattr(obj, '__array__'):
+            return numpy_module().asarray(obj).tolist()
+        return obj
+
+
+# 复制为 float64 数组 (用于 Decimal 存储的对象对外暴露缓冲区)
+def float_array(values):
+    return array('d', [float(x) for x in values])
+
+
+# Decimal 存储的对象转为 ndarray，必然产生一次复制
+def to_ndarray(values, shape, dtype=None, copy=None):
+    if copy is False:
+        raise ValueError(COPY_REQUIRED_MSG)
+    numpy = numpy_module()
+    result = numpy.frombuffer(float_array(values), dtype='d').reshape(shape)
+    if dtype is not None:
+        result = result.astype(dtype, copy=False)
+    return result
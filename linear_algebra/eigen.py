@@ -0,0 +1,411 @@
+# -*- coding:utf-8 -*-
+
+'''
+    对称矩阵的特征值与特征向量。
+
+    jacobi_eigen：Jacobi 旋转法，一次求出显式给出的小型稠密矩阵的全部特征对，
+    PlaneFitter 求 3x3 协方差矩阵的最小特征向量也用它。
+
+    power_iteration：幂迭代，逐个求按模最大的特征对，每求出一个就做 Hotelling 收缩
+    (A - lambda v v^T)，再求下一个。适合只需要前几个特征向量、特征值间隔明显的情形。
+
+    lanczos：Lanczos 迭代，带完全重正交化。只通过 matvec 访问算子，
+    因此可以用于无法显式存储的大型对称算子；Krylov 子空间上的三对角矩阵
+    用隐式 QL 方法求 Ritz 值，Ritz 残差足够小时停止，
+    最后用反迭代求出所需的 Ritz 向量。
+
+    算子可以是 Matrix、行序列，或者 matvec 回调 (此时需给出 dimension)：
+    回调接收一个 float 列表，返回同样长度的数值序列 (列表、Vector 等均可)。
+    计算使用 float，结果以 [(特征值, 单位特征向量 Vector)] 的形式返回。
+'''
+
+import random
+from math import copysign, hypot, sqrt
+
+from .vector import Vector
+from .matrix import Matrix
+
+MATRIX_MUST_BE_SYMMETRIC_MSG = 'The matrix must be symmetric'
+DIMENSION_REQUIRED_MSG = 'The dimension is required for a matvec callback'
+DID_NOT_CONVERGE_MSG = 'Eigenvalue iteration did not converge'
+NO_VECTORS_MSG = 'At least one vector is needed'
+VECTORS_MUST_HAVE_SAME_DIMENSION_MSG = 'All vectors should have the same dimension'
+
+
+def _dot(a, b):
+    return sum([x*y for x, y in zip(a, b)])
+
+
+def _norm(a):
+    return sqrt(_dot(a, a))
+
+
+# 从 x 中减去在 basis (单位正交向量) 上的分量
+def _orthogonalize(x, basis):
+    for v in basis:
+        c = _dot(v, x)
+        x = [xi - c*vi for xi, vi in zip(x, v)]
+    return x
+
+
+# 与 basis 正交的随机单位向量
+def _random_unit(rng, n, basis):
+    while True:
+        x = _orthogonalize([rng.gauss(0, 1) for _ in range(n)], basis)
+        length = _norm(x)
+        if length > 1e-8:
+            return [xi / length for xi in x]
+
+
+# 对称矩阵的 Jacobi 特征值分解，返回按特征值从小到大排列的 (特征值, 特征向量) 列表
+def _jacobi_eigen(a, tolerance=1e-15, max_sweeps=50):
+    n = len(a)
+    a = [list(row) for row in a]
+    v = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+
+    scale = sum([a[i][i]**2 for i in range(n)]) or 1.0
+    for _ in range(max_sweeps):
+        off = sum([a[i][j]**2 for i in range(n) for j in range(i+1, n)])
+        if off <= tolerance * scale:
+            break
+
+        for p in range(n):
+            for q in range(p+1, n):
+                if a[p][q] == 0:
+                    continue
+                theta = (a[q][q] - a[p][p]) / (2 * a[p][q])
+                t = (1.0 if theta >= 0 else -1.0) / (abs(theta) + sqrt(theta*theta + 1))
+                c = 1 / sqrt(t*t + 1)
+                s = t * c
+
+                for k in range(n):
+                    akp, akq = a[k][p], a[k][q]
+                    a[k][p] = c*akp - s*akq
+                    a[k][q] = s*akp + c*akq
+                for k in range(n):
+                    apk, aqk = a[p][k], a[q][k]
+                    a[p][k] = c*apk - s*aqk
+                    a[q][k] = s*apk + c*aqk
+                for k in range(n):
+                    vkp, vkq = v[k][p], v[k][q]
+                    v[k][p] = c*vkp - s*vkq
+                    v[k][q] = s*vkp + c*vkq
+
+    pairs = [(a[i][i], [v[k][i] for k in range(n)]) for i in range(n)]
+    pairs.sort(key=lambda pair: pair[0])
+    return pairs
+
+
+# 对称三对角矩阵 (对角线 alpha，次对角线 beta) 的隐式位移 QL 分解，返回全部特征值。
+# rows 给出需要的特征向量矩阵的行号，只累积这些行上的旋转
+def _tridiagonal_eigen(alpha, beta, rows=()):
+    m = len(alpha)
+    d = list(alpha)
+    e = list(beta) + [0.0]
+    z = dict([(k, [1.0 if i == k else 0.0 for i in range(m)]) for k in rows])
+
+    for l in range(m):
+        iterations = 0
+        while True:
+            for j in range(l, m - 1):
+                if abs(e[j]) <= 1e-16 * (abs(d[j]) + abs(d[j+1])):
+                    break
+            else:
+                j = m - 1
+            if j == l:
+                break
+
+            iterations += 1
+            if iterations > 50:
+                raise Exception(DID_NOT_CONVERGE_MSG)
+
+            g = (d[l+1] - d[l]) / (2 * e[l])
+            r = hypot(g, 1.0)
+            g = d[j] - d[l] + e[l] / (g + copysign(r, g))
+            s, c, p = 1.0, 1.0, 0.0
+            i = j - 1
+            while i >= l:
+                f, b = s * e[i], c * e[i]
+                r = hypot(f, g)
+                e[i+1] = r
+                if r == 0:
+                    d[i+1] -= p
+                    e[j] = 0.0
+                    break
+                s, c = f / r, g / r
+                g = d[i+1] - p
+                r = (d[i] - g) * s + 2 * c * b
+                p = s * r
+                d[i+1] = g + p
+                g = c * r - b
+                for row in z.values():
+                    f = row[i+1]
+                    row[i+1] = s * row[i] + c * f
+                    row[i] = c * row[i] - s * f
+                i -= 1
+            else:
+                d[l] -= p
+                e[l] = g
+                e[j] = 0.0
+
+    return d, z
+
+
+# 解三对角方程组 (T - shift*I) x = rhs，部分主元消元 (同 LAPACK dgtsv)，
+# 主元为零时用 tiny 代替，供反迭代使用
+def _solve_shifted_tridiagonal(alpha, beta, shift, rhs, tiny):
+    m = len(alpha)
+    d = [a - shift for a in alpha]
+    dl, du, du2 = list(beta), list(beta), [0.0] * m
+    x = list(rhs)
+
+    for i in range(m - 1):
+        if abs(d[i]) >= abs(dl[i]):
+            if d[i] == 0:
+                d[i] = tiny
+            fact = dl[i] / d[i]
+            d[i+1] -= fact * du[i]
+            x[i+1] -= fact * x[i]
+        else:
+            fact = d[i] / dl[i]
+            d[i] = dl[i]
+            temp = d[i+1]
+            d[i+1] = du[i] - fact * temp
+            if i + 1 < m - 1:
+                du2[i] = du[i+1]
+                du[i+1] = -fact * du2[i]
+            du[i] = temp
+            x[i], x[i+1] = x[i+1], x[i] - fact * x[i+1]
+
+    for i in range(m)[::-1]:
+        if d[i] == 0:
+            d[i] = tiny
+        t = x[i]
+        if i + 1 < m:
+            t -= du[i] * x[i+1]
+        if i + 2 < m:
+            t -= du2[i] * x[i+2]
+        x[i] = t / d[i]
+    return x
+
+
+# 用反迭代求三对角矩阵对应于 values 的单位特征向量，
+# 并与之前求出的向量正交化，使特征值相近时仍得到正交的一组向量
+def _tridiagonal_eigenvectors(alpha, beta, values):
+    m = len(alpha)
+    norm = max([abs(a) for a in alpha] + [abs(b) for b in beta] + [1e-300])
+    vectors = []
+    for value in values:
+        x = [1.0 / sqrt(m)] * m
+        for _ in range(3):
+            x = _orthogonalize(_solve_shifted_tridiagonal(alpha, beta, value, x, 1e-16 * norm), vectors)
+            length = _norm(x)
+            x = [xi / length for xi in x]
+        vectors.append(x)
+    return vectors
+
+
+# 返回 (matvec, n)，matvec 接收并返回 float 列表
+def _as_operator(operator, dimension):
+    if callable(operator):
+        if dimension is None:
+            raise Exception(DIMENSION_REQUIRED_MSG)
+        return (lambda x: [float(y) for y in operator(x)]), dimension
+
+    rows = _symmetric_rows(operator)
+    return (lambda x: [_dot(row, x) for row in rows]), len(rows)
+
+
+# Matrix 或行序列转为 float 行，并检查是否对称
+def _symmetric_rows(matrix):
+    if not isinstance(matrix, Matrix):
+        matrix = Matrix(matrix)
+    if not matrix.is_square():
+        raise Exception(MATRIX_MUST_BE_SYMMETRIC_MSG)
+
+    rows = [[float(x) for x in matrix.row(i)] for i in range(matrix.num_rows)]
+    n = len(rows)
+    scale = max([abs(x) for row in rows for x in row])
+    for i in range(n):
+        for j in range(i+1, n):
+            if abs(rows[i][j] - rows[j][i]) > 1e-12 * scale:
+                raise Exception(MATRIX_MUST_BE_SYMMETRIC_MSG)
+    return rows
+
+
+def _check_k(k, n):
+    if not 1 <= k <= n:
+        raise ValueError('k must be between 1 and the dimension of the operator')
+
+
+# 完整分解显式给出的小型稠密对称矩阵，按特征值从小到大返回全部特征对
+def jacobi_eigen(matrix, tolerance=1e-15, max_sweeps=50):
+    pairs = _jacobi_eigen(_symmetric_rows(matrix), tolerance, max_sweeps)
+    return [(value, Vector(vector)) for value, vector in pairs]
+
+
+# 幂迭代 + Hotelling 收缩，按特征值的模从大到小返回前 k 个特征对。
+# 残差 |Ax - lambda x| 不超过 tolerance 乘以已知的最大特征值的模时视为收敛
+def power_iteration(operator, k=1, tolerance=1e-10, max_iterations=1000, dimension=None, seed=None):
+    matvec, n = _as_operator(operator, dimension)
+    _check_k(k, n)
+    rng = random.Random(seed)
+    pairs = []
+
+    def deflated(x):
+        y = matvec(x)
+        for value, v in pairs:
+            c = value * _dot(v, x)
+            y = [yi - c*vi for yi, vi in zip(y, v)]
+        return y
+
+    for _ in range(k):
+        x = _random_unit(rng, n, [v for _, v in pairs])
+
+        for _ in range(max_iterations):
+            y = deflated(x)
+            value = _dot(x, y)
+            residual = _norm([yi - value*xi for xi, yi in zip(x, y)])
+            scale = max([abs(value)] + [abs(v) for v, _ in pairs[:1]])
+            if residual <= tolerance * scale:
+                break
+
+            length = _norm(y)
+            if length == 0:
+                # 剩下的特征值全为零，x 本身就是特征向量
+                value = 0.0
+                break
+            x = [yi / length for yi in y]
+        else:
+            raise Exception(DID_NOT_CONVERGE_MSG)
+
+        pairs.append((value, x))
+
+    return [(value, Vector(x)) for value, x in pairs]
+
+
+# 带完全重正交化的 Lanczos 迭代。which 为 'largest' 或 'smallest'，
+# 分别返回代数值最大 (从大到小) 或最小 (从小到大) 的 k 个特征对。
+# Ritz 残差 |beta_m s_m| 不超过 tolerance 乘以算子范数的估计时视为收敛
+def lanczos(operator, k=1, which='largest', tolerance=1e-10, max_iterations=None,
+            dimension=None, seed=None):
+    if which not in ('largest', 'smallest'):
+        raise ValueError("which must be 'largest' or 'smallest'")
+
+    matvec, n = _as_operator(operator, dimension)
+    _check_k(k, n)
+    max_iterations = n if max_iterations is None else min(n, max_iterations)
+    rng = random.Random(seed)
+
+    basis, alpha, beta = [], [], []
+    norm_estimate = 0.0
+    next_check = k
+    q = _random_unit(rng, n, basis)
+
+    while True:
+        basis.append(q)
+        w = matvec(q)
+        alpha.append(_dot(q, w))
+        # 完全重正交化，做两遍以抵消舍入误差
+        w = _orthogonalize(_orthogonalize(w, basis), basis)
+        b = _norm(w)
+        m = len(basis)
+        norm_estimate = max(norm_estimate, abs(alpha[-1]) + b + (beta[-1] if beta else 0.0))
+        breakdown = b <= 1e-14 * norm_estimate
+
+        # Krylov 子空间增大后才重新求 Ritz 值，求解次数只随 m 对数增长
+        if m >= next_check or m == max_iterations or breakdown:
+            values, z = _tridiagonal_eigen(alpha, beta[:m-1], rows=[m-1])
+            order = sorted(range(m), key=lambda i: values[i], reverse=(which == 'largest'))[:k]
+
+            # 第 i 个 Ritz 对的残差为 |beta_m * s_i[m-1]|
+            converged = m >= k and all([abs(b * z[m-1][i]) <= tolerance * norm_estimate
+                                        for i in order])
+            if converged or m == n:
+                selected = [values[i] for i in order]
+                pairs = []
+                for value, s in zip(selected, _tridiagonal_eigenvectors(alpha, beta[:m-1], selected)):
+                    y = [sum([s[j] * basis[j][i] for j in range(m)]) for i in range(n)]
+                    length = _norm(y)
+                    pairs.append((value, Vector([yi / length for yi in y])))
+                return pairs
+            if m == max_iterations:
+                raise Exception(DID_NOT_CONVERGE_MSG)
+            next_check = m + max(1, m // 8)
+
+        if breakdown:
+            # 找到了不变子空间，从与之正交的新方向继续
+            q = _random_unit(rng, n, basis)
+            beta.append(0.0)
+        else:
+            q = [wi / b for wi in w]
+            beta.append(b)
+
+
+# 一组向量 (Vector、坐标序列或 VectorArray) 的协方差矩阵 (除以向量个数)
+def covariance_matrix(vectors):
+    points = [[float(x) for x in v] for v in vectors]
+    if not points:
+        raise Exception(NO_VECTORS_MSG)
+    n = len(points[0])
+    if any([len(p) != n for p in points]):
+        raise Exception(VECTORS_MUST_HAVE_SAME_DIMENSION_MSG)
+
+    count = len(points)
+    mean = [sum([p[i] for p in points]) / count for i in range(n)]
+    centered = [[p[i] - mean[i] for i in range(n)] for p in points]
+    return Matrix([[sum([c[i] * c[j] for c in centered]) / count for j in range(n)]
+                   for i in range(n)])
+
+
+if __name__ == '__main__':
+
+    rng = random.Random(1)
+
+    # 主要沿 (1, 1, 0) 方向分布的点
+    points = []
+    for _ in range(500):
+        s, t, u = rng.gauss(0, 3), rng.gauss(0, 1), rng.gauss(0, 0.1)
+        points.append(Vector([s + t, s - t, u]))
+    covariance = covariance_matrix(points)
+
+    for value, vector in power_iteration(covariance, k=2, seed=1):
+        print('power:   {:.4f} {}'.format(value, vector))
+    for value, vector in lanczos(covariance, k=2, seed=1):
+        print('lanczos: {:.4f} {}'.format(value, vector))
+
+    # 不显式存储矩阵的算子：一维离散 Laplace 算子，最小特征值为 2 - 2cos(pi/(n+1))
+    n = 200
+
+    def laplacian(x):
+        return [2*x[i] - (x[i-1] if i > 0 else 0.0) - (x[i+1] if i + 1 < n else 0.0)
+                for i in range(n)]
+
+    value, _ = lanczos(laplacian, which='smallest', dimension=n, seed=1)[0]
+    print('laplacian smallest: {:.8f}'.format(value))
+
+    # 自检：随机对称矩阵 (含不定矩阵) 上，幂迭代与 Lanczos 的结果应与 Jacobi 完整分解一致
+    def close(a, b):
+        return abs(a - b) <= 1e-6 * max(1.0, abs(b))
+
+    for trial in range(40):
+        n = rng.randint(2, 20)
+        b = [[rng.gauss(0, 1) for _ in range(n)] for _ in range(n)]
+        shift = 3.0 if trial % 2 else 0.0
+        a = [[sum([b[i][l] * b[j][l] for l in range(n)]) - (shift if i == j else 0.0)
+              for j in range(n)] for i in range(n)]
+        reference = [value for value, _ in jacobi_eigen(a)]
+        k = min(n, rng.randint(1, 3))
+
+        largest = [value for value, _ in lanczos(a, k=k, seed=trial)]
+        smallest = [value for value, _ in lanczos(a, k=k, which='smallest', seed=trial)]
+        if not all(map(close, largest, reference[::-1][:k])):
+            raise Exception('lanczos (largest) disagrees with jacobi on trial {}'.format(trial))
+        if not all(map(close, smallest, reference[:k])):
+            raise Exception('lanczos (smallest) disagrees with jacobi on trial {}'.format(trial))
+
+        if not shift:
+            dominant = [value for value, _ in power_iteration(a, k=k, seed=trial, max_iterations=20000)]
+            if not all(map(close, dominant, reference[::-1][:k])):
+                raise Exception('power iteration disagrees with jacobi on trial {}'.format(trial))
+    print('power iteration and lanczos match jacobi on 40 random matrices')
@@ -0,0 +1,193 @@
+# -*- coding:utf-8 -*-
+
+'''
+    半平面交：每条直线 Line(n, c) 表示半平面 n.x <= c，
+    求所有半平面的公共部分 (凸多边形)。
+
+    做法是把边界直线按方向角排序后用双端队列扫描，复杂度 O(n log n)。
+    计算时额外加入一个很大的包围盒，使扫描过程始终处理有界区域；
+    最终区域是否有界由法向量方向是否“环绕”整个平面判断
+    (相邻法向量之间的最大夹角小于 pi 时区域有界)。
+'''
+
+from collections import deque
+from math import atan2, pi, sqrt
+
+from .vector import Vector
+
+EMPTY_REGION_MSG = 'The intersection of the half-planes is empty'
+UNBOUNDED_REGION_MSG = 'The intersection of the half-planes is unbounded'
+ONLY_DEFINED_IN_TWO_DIMS_MSG = 'Half-plane intersection is only defined for 2d lines'
+
+_EPS = 1e-12
+
+
+class _HalfPlane(object):
+    '''
+        有向直线 p + t*d，可行区域在方向 d 的左侧。
+        对 n.x <= c，取 d = (-n_y, n_x) / |n|，p = n*c / |n|^2。
+    '''
+
+    def __init__(self, nx, ny, c, is_box=False):
+        length = sqrt(nx*nx + ny*ny)
+        self.dx, self.dy = -ny / length, nx / length
+        self.px, self.py = nx * c / (length*length), ny * c / (length*length)
+        self.angle = atan2(self.dy, self.dx)
+        self.is_box = is_box
+
+    # 点是否严格位于可行区域之外 (方向 d 的右侧)
+    def out(self, x, y):
+        return self.dx * (y - self.py) - self.dy * (x - self.px) < -_EPS
+
+    def intersection(self, other):
+        cross = self.dx * other.dy - self.dy * other.dx
+        t = ((other.px - self.px) * other.dy - (other.py - self.py) * other.dx) / cross
+        return self.px + t * self.dx, self.py + t * self.dy
+
+
+def _is_bounded(half_planes):
+    angles = sorted([h.angle for h in half_planes])
+    if not angles:
+        return False
+    gaps = [b - a for a, b in zip(angles, angles[1:])]
+    gaps.append(angles[0] + 2*pi - angles[-1])
+    return max(gaps) < pi - _EPS
+
+
+def _sweep(half_planes):
+    half_planes = sorted(half_planes, key=lambda h: h.angle)
+    dq = deque()
+
+    for h in half_planes:
+        while len(dq) > 1 and h.out(*dq[-1].intersection(dq[-2])):
+            dq.pop()
+        while len(dq) > 1 and h.out(*dq[0].intersection(dq[1])):
+            dq.popleft()
+
+        if dq and abs(h.dx * dq[-1].dy - h.dy * dq[-1].dx) < _EPS:
+            # 方向相反且相邻：在包围盒内两者之间没有公共部分
+            if h.dx * dq[-1].dx + h.dy * dq[-1].dy < 0:
+                return []
+            # 方向相同：只保留更严格的一个
+            if h.out(dq[-1].px, dq[-1].py):
+                dq.pop()
+            else:
+                continue
+
+        dq.append(h)
+
+    while len(dq) > 2 and dq[0].out(*dq[-1].intersection(dq[-2])):
+        dq.pop()
+    while len(dq) > 2 and dq[-1].out(*dq[0].intersection(dq[1])):
+        dq.popleft()
+
+    if len(dq) < 3:
+        return []
+    return list(dq)
+
+
+# 点集的外接矩形对角线长度，以及坐标本身的舍入误差量级 (与到原点的距离成正比)
+def _extent(points):
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    extent = sqrt((max(xs) - min(xs))**2 + (max(ys) - min(ys))**2)
+    noise = 1e-12 * max([abs(c) for c in xs + ys])
+    return extent, noise
+
+
+def _vertices(boundary):
+    points = [boundary[i].intersection(boundary[(i + 1) % len(boundary)])
+              for i in range(len(boundary))]
+    if not points:
+        return []
+    extent, noise = _extent(points)
+    tolerance = max(1e-12 * extent, noise)
+
+    def same(p, q):
+        return abs(p[0] - q[0]) <= tolerance and abs(p[1] - q[1]) <= tolerance
+
+    vertices = []
+    for point in points:
+        if not vertices or not same(point, vertices[-1]):
+            vertices.append(point)
+    if len(vertices) > 1 and same(vertices[0], vertices[-1]):
+        vertices.pop()
+    return vertices
+
+
+# 少于三个顶点，或多边形的“厚度” (2*面积/周长) 相对它自身的大小可以忽略时视为退化。
+# 面积以第一个顶点为原点计算，避免远离原点时的相消误差
+def _is_degenerate(vertices):
+    if len(vertices) < 3:
+        return True
+    x0, y0 = vertices[0]
+    count = len(vertices)
+    area = 0.0
+    perimeter = 0.0
+    for i in range(count):
+        (x1, y1), (x2, y2) = vertices[i], vertices[(i + 1) % count]
+        area += (x1 - x0)*(y2 - y0) - (x2 - x0)*(y1 - y0)
+        perimeter += sqrt((x2 - x1)**2 + (y2 - y1)**2)
+    extent, noise = _extent(vertices)
+    return abs(area) <= max(1e-9 * extent, noise) * perimeter
+
+
+# 求半平面交，按逆时针顺序返回凸多边形的顶点 (Vector)。
+# 区域为空 (包括面积为零的退化情形) 或无界时抛出异常
+def half_plane_intersection(lines):
+    half_planes = []
+    scale = 1.0
+
+    for line in lines:
+        n = line.normal_vector
+        if n.dimension != 2:
+            raise Exception(ONLY_DEFINED_IN_TWO_DIMS_MSG)
+        nx, ny = float(n[0]), float(n[1])
+        c = float(line.constant_term)
+
+        if nx == 0 and ny == 0:
+            # 0 <= c
+            if c < 0:
+                raise Exception(EMPTY_REGION_MSG)
+            continue
+
+        h = _HalfPlane(nx, ny, c)
+        half_planes.append(h)
+        scale = max(scale, abs(h.px), abs(h.py))
+
+    bounded = _is_bounded(half_planes)
+
+    # 包围盒足够大时，它的边不会出现在有界区域的边界上；
+    # 若仍然出现，说明区域比包围盒大，放大后重试
+    size = 1e6 * scale
+    for _ in range(4):
+        box = [_HalfPlane(1, 0, size, True), _HalfPlane(-1, 0, size, True),
+               _HalfPlane(0, 1, size, True), _HalfPlane(0, -1, size, True)]
+        boundary = _sweep(half_planes + box)
+        vertices = _vertices(boundary)
+
+        if _is_degenerate(vertices):
+            raise Exception(EMPTY_REGION_MSG)
+        if not bounded:
+            raise Exception(UNBOUNDED_REGION_MSG)
+        if not any([h.is_box for h in boundary]):
+            break
+        size *= 1e3
+
+    return [Vector([x, y]) for x, y in vertices]
+
+
+if __name__ == '__main__':
+
+    from .line import Line
+
+    # 0 <= x <= 2, 0 <= y <= 2, x + y <= 3
+    lines = [Line(Vector([-1, 0]), 0), Line(Vector([1, 0]), 2),
+             Line(Vector([0, -1]), 0), Line(Vector([0, 1]), 2),
+             Line(Vector([1, 1]), 3)]
+    print('vertices: {}'.format([str(v) for v in half_plane_intersection(lines)]))
+
+    try:
+        half_plane_intersection(lines[:2])
+    except Exception as e:
+        print(e)
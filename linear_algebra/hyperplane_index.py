@@ -0,0 +1,259 @@
+# -*- coding:utf-8 -*-
+
+'''
+    超平面 (Plane/Line) 集合上的空间索引，按法向量方向分桶。
+
+    每个超平面 n.x = c 先化为单位法向量 u 与偏移 d = c/|n|，
+    并统一 u 的朝向 (第一个非零分量为正)，使 n 与 -n 落入同一个桶。
+    桶内所有超平面的 u 与桶方向 w 的偏差不超过 eps，
+    因此对点 p 有 |u.p - w.p| <= eps*|p|：
+    只需在按 d 排序的桶内二分查找 w.p，再在误差带内做精确计算，
+    而不必逐一计算点到每个超平面的距离。
+'''
+
+import time
+from bisect import bisect_left, bisect_right
+from math import sqrt
+
+# 浮点舍入的保险余量，按点的模长缩放
+_ROUNDING_SLACK = 1e-12
+
+
+def _dot(a, b):
+    return sum([x*y for x, y in zip(a, b)])
+
+
+def _as_point(point):
+    return tuple([float(x) for x in point])
+
+
+class _Bucket(object):
+
+    def __init__(self, members):
+        # members: [(u, d, sign, index)]，u 已统一朝向
+        dimension = len(members[0][0])
+        total = [sum([m[0][k] for m in members]) for k in range(dimension)]
+        length = sqrt(_dot(total, total))
+        self.direction = tuple([x / length for x in total])
+        self.eps = max([sqrt(sum([(a - b)**2 for a, b in zip(m[0], self.direction)]))
+                        for m in members])
+
+        # 所有成员按偏移量排序，用于最近超平面查询
+        members = sorted(members, key=lambda m: m[1])
+        self.offsets = [m[1] for m in members]
+        self.members = members
+
+        # 按朝向符号拆分，用于半空间查询
+        self.positive = [m for m in members if m[2] > 0]
+        self.negative = [m for m in members if m[2] < 0]
+        self.positive_offsets = [m[1] for m in self.positive]
+        self.negative_offsets = [m[1] for m in self.negative]
+
+    def __len__(self):
+        return len(self.members)
+
+
+class IndexStatistics(object):
+
+    def __init__(self):
+        self.build_time = 0.0
+        self.num_hyperplanes = 0
+        self.num_buckets = 0
+        self.max_bucket_size = 0
+        self.max_bucket_eps = 0.0
+        self.num_queries = 0
+        self.query_time = 0.0
+        self.candidates_evaluated = 0
+        self.buckets_visited = 0
+
+    def summary(self):
+        queries = max(self.num_queries, 1)
+        return {
+            'hyperplanes': self.num_hyperplanes,
+            'buckets': self.num_buckets,
+            'max_bucket_size': self.max_bucket_size,
+            'max_bucket_eps': self.max_bucket_eps,
+            'build_time': self.build_time,
+            'queries': self.num_queries,
+            'query_time': self.query_time,
+            'mean_candidates_per_query': float(self.candidates_evaluated) / queries,
+            'mean_buckets_per_query': float(self.buckets_visited) / queries,
+        }
+
+
+class HyperplaneIndex(object):
+    '''
+        一次性建立在 Plane 或 Line 集合上的索引，支持批量查询：
+          nearest(points)            -- 最近的超平面及带符号距离
+          half_space_members(points) -- 点满足 n.x <= c 的超平面编号
+        带符号距离为 (n.p - c) / |n|，即点位于法向量一侧时为正。
+        resolution 为分桶时单位法向量各分量的量化步长，越小则桶越多、eps 越小。
+    '''
+
+    ZERO_NORMAL_VECTOR_MSG = 'Cannot index a hyperplane with a zero normal vector'
+    ALL_HYPERPLANES_MUST_BE_IN_SAME_DIM_MSG = 'All hyperplanes should live in the same dimension'
+    NO_HYPERPLANES_MSG = 'Cannot build an index over an empty collection'
+
+    def __init__(self, hyperplanes, resolution=0.1):
+        if resolution <= 0:
+            raise ValueError('resolution must be positive')
+
+        start = time.perf_counter()
+        self.hyperplanes = list(hyperplanes)
+        if not self.hyperplanes:
+            raise ValueError(self.NO_HYPERPLANES_MSG)
+
+        self.dimension = self.hyperplanes[0].normal_vector.dimension
+        self.resolution = resolution
+        self.statistics = IndexStatistics()
+
+        groups = {}
+        for index, h in enumerate(self.hyperplanes):
+            n = _as_point(h.normal_vector)
+            if len(n) != self.dimension:
+                raise Exception(self.ALL_HYPERPLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+            length = sqrt(_dot(n, n))
+            if length == 0:
+                raise Exception(self.ZERO_NORMAL_VECTOR_MSG)
+
+            u = [x / length for x in n]
+            d = float(h.constant_term) / length
+            sign = 1
+            for x in u:
+                if x != 0:
+                    sign = 1 if x > 0 else -1
+                    break
+            u = tuple([x * sign for x in u])
+
+            key = tuple([int(round(x / resolution)) for x in u])
+            groups.setdefault(key, []).append((u, d * sign, sign, index))
+
+        self._buckets = [_Bucket(members) for members in groups.values()]
+
+        stats = self.statistics
+        stats.num_hyperplanes = len(self.hyperplanes)
+        stats.num_buckets = len(self._buckets)
+        stats.max_bucket_size = max([len(b) for b in self._buckets])
+        stats.max_bucket_eps = max([b.eps for b in self._buckets])
+        stats.build_time = time.perf_counter() - start
+
+    def __len__(self):
+        return len(self.hyperplanes)
+
+    # 精确计算点到第 index 个超平面的带符号距离
+    def signed_distance(self, point, index):
+        h = self.hyperplanes[index]
+        n = _as_point(h.normal_vector)
+        p = _as_point(point)
+        return (_dot(n, p) - float(h.constant_term)) / sqrt(_dot(n, n))
+
+    def nearest(self, points):
+        start = time.perf_counter()
+        results = [self._nearest(_as_point(p)) for p in points]
+        self.statistics.query_time += time.perf_counter() - start
+        self.statistics.num_queries += len(results)
+        return results
+
+    def _nearest(self, p):
+        stats = self.statistics
+        norm = sqrt(_dot(p, p))
+        rounding = _ROUNDING_SLACK * (norm + 1)
+
+        # 先计算每个桶的距离下界，按下界从小到大访问桶
+        candidates = []
+        for bucket in self._buckets:
+            t = _dot(bucket.direction, p)
+            offsets = bucket.offsets
+            k = bisect_left(offsets, t)
+            gap = min([abs(t - offsets[j]) for j in (k - 1, k) if 0 <= j < len(offsets)])
+            slack = bucket.eps * norm + rounding
+            candidates.append((gap - slack, t, k, slack, bucket))
+        candidates.sort(key=lambda c: c[0])
+
+        best_index, best_distance, best_abs = -1, 0.0, float('inf')
+
+        for lower_bound, t, k, slack, bucket in candidates:
+            if lower_bound >= best_abs:
+                break
+            stats.buckets_visited += 1
+            offsets = bucket.offsets
+            members = bucket.members
+
+            # 从插入点向两侧扩展，直到下界超过当前最优值
+            left, right = k - 1, k
+            while left >= 0 or right < len(offsets):
+                left_gap = t - offsets[left] if left >= 0 else float('inf')
+                right_gap = offsets[right] - t if right < len(offsets) else float('inf')
+                if left_gap <= right_gap:
+                    j, gap = left, left_gap
+                    left -= 1
+                else:
+                    j, gap = right, right_gap
+                    right += 1
+                if gap - slack >= best_abs:
+                    break
+
+                u, d, sign, index = members[j]
+                stats.candidates_evaluated += 1
+                distance = _dot(u, p) - d
+                if abs(distance) < best_abs:
+                    best_index, best_distance, best_abs = index, distance * sign, abs(distance)
+
+        return best_index, best_distance
+
+    def half_space_members(self, points):
+        start = time.perf_counter()
+        results = [self._half_space_members(_as_point(p)) for p in points]
+        self.statistics.query_time += time.perf_counter() - start
+        self.statistics.num_queries += len(results)
+        return results
+
+    def _half_space_members(self, p):
+        stats = self.statistics
+        norm = sqrt(_dot(p, p))
+        rounding = _ROUNDING_SLACK * (norm + 1)
+        inside = []
+
+        for bucket in self._buckets:
+            stats.buckets_visited += 1
+            t = _dot(bucket.direction, p)
+            slack = bucket.eps * norm + rounding
+
+            # sign > 0: 条件 u.p <= d；d >= t + slack 的一定满足，d < t - slack 的一定不满足
+            lo = bisect_left(bucket.positive_offsets, t - slack)
+            hi = bisect_left(bucket.positive_offsets, t + slack)
+            inside.extend([m[3] for m in bucket.positive[hi:]])
+            for u, d, sign, index in bucket.positive[lo:hi]:
+                stats.candidates_evaluated += 1
+                if _dot(u, p) <= d:
+                    inside.append(index)
+
+            # sign < 0: 条件 u.p >= d；d <= t - slack 的一定满足
+            lo = bisect_right(bucket.negative_offsets, t - slack)
+            hi = bisect_right(bucket.negative_offsets, t + slack)
+            inside.extend([m[3] for m in bucket.negative[:lo]])
+            for u, d, sign, index in bucket.negative[lo:hi]:
+                stats.candidates_evaluated += 1
+                if _dot(u, p) >= d:
+                    inside.append(index)
+
+        inside.sort()
+        return inside
+
+
+if __name__ == '__main__':
+
+    import random
+    from .vector import Vector
+    from .plane import Plane
+
+    random.seed(0)
+    planes = [Plane(Vector([random.uniform(-1, 1) for _ in range(3)]), random.uniform(-10, 10))
+              for _ in range(2000)]
+    index = HyperplaneIndex(planes, resolution=0.2)
+
+    points = [[random.uniform(-10, 10) for _ in range(3)] for _ in range(200)]
+    nearest = index.nearest(points)
+    print('nearest plane to first point: {} (distance {:.4f})'.format(*nearest[0]))
+    print('statistics: {}'.format(index.statistics.summary()))
@@ -1,10 +1,9 @@
 # -*- coding:utf-8 -*- 
 
-from decimal import Decimal, getcontext
+from decimal import Decimal
 
-from vector import Vector
+from .vector import Vector
 
-getcontext().prec = 30
 
 class MyDecimal(Decimal):
     def is_near_zero(self, eps=1e-10):
@@ -45,11 +44,11 @@ class Line(object):
         elif line2.normal_vector.is_zero():
             return False
 
-        if not self.is_parallel(line2):
+        if not self.is_parallel_to(line2):
             return False
 
         basepoint_difference = self.basepoint.minus(line2.basepoint)
-        return basepoint_difference.is_orthogonal(self.normal_vector)
+        return basepoint_difference.is_orthogonal_to(self.normal_vector)
     
     def set_basepoint(self):
         try:
@@ -152,26 +151,30 @@ class Line(object):
         
 if __name__ == '__main__':
 
+    from decimal import getcontext
+    from .vector import DECIMAL_PRECISION
+    getcontext().prec = DECIMAL_PRECISION
+
     # first system
     # 4.046x + 2.836y = 1.21
     # 10.115x + 7.09y = 3.025
     line1 = Line(Vector([4.046, 2.836]), 1.21)
     line2 = Line(Vector([10.115, 7.09]), 3.025)
-    print 'first system intersects in: {}'.format(line1.intersection_with(line2))
+    print('first system intersects in: {}'.format(line1.intersection_with(line2)))
 
     # second system
     # 7.204x + 3.182y = 8.68
     # 8.172x + 4.114y = 9.883
     line3 = Line(Vector([7.204, 3.182]), 8.68)
     line4 = Line(Vector([8.172, 4.114]), 9.883)
-    print 'second system intersects in: {}'.format(line3.intersection_with(line4))
+    print('second system intersects in: {}'.format(line3.intersection_with(line4)))
 
     # third system
     # 1.182x + 5.562y = 6.744
     # 1.773x + 8.343y = 9.525
     line5 = Line(Vector([1.182, 5.562]), 6.744)
     line6 = Line(Vector([1.773, 8.343]), 9.525)
-    print 'third system intersects in: {}'.format(line5.intersection_with(line6))
+    print('third system intersects in: {}'.format(line5.intersection_with(line6)))
     
 
     
@@ -0,0 +1,466 @@
+from decimal import Decimal
+from copy import deepcopy
+
+from .vector import Vector
+from .plane import Plane
+from .buffers import buffer_tolist, to_ndarray
+
+
+
+class LinearSystem(object):
+
+    ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG = 'All planes in the system should live in the same dimension'
+    NO_SOLUTIONS_MSG = 'No solutions'
+    INF_SOLUTIONS_MSG = 'Infinitely many solutions'
+    DETERMINANT_REQUIRES_SQUARE_SYSTEM_MSG = 'Determinant is only defined for square systems'
+
+    def __init__(self, planes):
+        try:
+            d = planes[0].dimension
+            for p in planes:
+                assert p.dimension == d
+
+            self.planes = planes
+            self.dimension = d
+            self._elimination_cache = {}
+            self._elimination_snapshot = None
+
+        except AssertionError:
+            raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+
+    # 由系数矩阵和常数项构造方程组，接受嵌套序列或 NumPy 数组等缓冲区对象
+    @classmethod
+    def from_arrays(cls, coefficients, constants):
+        coefficients = buffer_tolist(coefficients)
+        constants = buffer_tolist(constants)
+        if len(coefficients) != len(constants):
+            raise Exception('Coefficients and constants must have the same number of rows')
+
+        return cls([Plane(normal_vector=Vector(row), constant_term=Decimal(k))
+                    for row, k in zip(coefficients, constants)])
+
+
+    def coefficients_array(self, dtype=None):
+        values = [x for p in self.planes for x in p.normal_vector.coordinates]
+        return to_ndarray(values, (len(self), self.dimension), dtype)
+
+
+    def constants_array(self, dtype=None):
+        return to_ndarray([p.constant_term for p in self.planes], (len(self),), dtype)
+
+
+    def __array__(self, dtype=None, copy=None):
+        values = [x for p in self.planes for x in p.normal_vector.coordinates]
+        return to_ndarray(values, (len(self), self.dimension), dtype, copy)
+
+
+    def swap_rows(self, row1, row2):
+        #pass # add your code here
+        self[row1], self[row2] = self[row2], self[row1]
+
+
+    def multiply_coefficient_and_row(self, coefficient, row):
+        #pass # add your code here
+        n = self[row].normal_vector
+        k = self[row].constant_term
+        
+        new_normal_vector = n.times_scalar(coefficient)
+        new_constant_term = k * coefficient
+        
+        self[row] = Plane(normal_vector=new_normal_vector, constant_term=new_constant_term)
+    
+
+    def add_multiple_times_row_to_row(self, coefficient, row_to_add, row_to_be_added_to):
+        #pass # add your code here
+        n1 = self[row_to_add].normal_vector
+        n2 = self[row_to_be_added_to].normal_vector
+        k1 = self[row_to_add].constant_term
+        k2 = self[row_to_be_added_to].constant_term
+        
+        new_normal_vector = n1.times_scalar(coefficient).plus(n2)
+        new_constant_term = (k1 * coefficient) + k2
+        
+        self[row_to_be_added_to] = Plane(normal_vector=new_normal_vector, constant_term=new_constant_term)
+
+
+    # 高斯消元，化为三角形式
+    def compute_triangular_form(self):
+        system = deepcopy(self)
+
+        num_equations = len(system)
+        num_variables = system.dimension
+
+        col = 0
+        for row in range(num_equations):
+            while col < num_variables:
+                c = MyDecimal(system[row].normal_vector[col])
+                if c.is_near_zero():
+                    swap_succeeded = system.swap_with_row_below_for_nonzero_coefficient_if_able(row, col)
+                    if not swap_succeeded:
+                        col += 1
+                        continue
+
+                system.clear_coefficients_below(row, col)
+                col += 1
+                break
+
+        return system
+
+
+    def swap_with_row_below_for_nonzero_coefficient_if_able(self, row, col):
+        num_equations = len(self)
+
+        for k in range(row+1, num_equations):
+            coefficient = MyDecimal(self[k].normal_vector[col])
+            if not coefficient.is_near_zero():
+                self.swap_rows(row, k)
+                return True
+
+        return False
+
+
+    def clear_coefficients_below(self, row, col):
+        num_equations = len(self)
+        beta = MyDecimal(self[row].normal_vector[col])
+
+        for k in range(row+1, num_equations):
+            n = self[k].normal_vector
+            gamma = n[col]
+            alpha = -gamma/beta
+            self.add_multiple_times_row_to_row(alpha, row, k)
+
+
+    # 化为简化行阶梯形式 (RREF)
+    def compute_rref(self):
+        tf = self.compute_triangular_form()
+
+        num_equations = len(tf)
+        pivot_indices = tf.indices_of_first_nonzero_terms_in_each_row()
+
+        for row in range(num_equations)[::-1]:
+            pivot_var = pivot_indices[row]
+            if pivot_var < 0:
+                continue
+            tf.scale_row_to_make_coefficient_equal_one(row, pivot_var)
+            tf.clear_coefficients_above(row, pivot_var)
+
+        return tf
+
+
+    def scale_row_to_make_coefficient_equal_one(self, row, col):
+        n = self[row].normal_vector
+        beta = Decimal('1.0') / n[col]
+        self.multiply_coefficient_and_row(beta, row)
+
+
+    def clear_coefficients_above(self, row, col):
+        for k in range(row)[::-1]:
+            n = self[k].normal_vector
+            alpha = -(n[col])
+            self.add_multiple_times_row_to_row(alpha, row, k)
+
+
+    # 求解方程组，无解或有无穷多解时抛出异常
+    def compute_solution(self):
+        rref = self.compute_rref()
+
+        rref.raise_exception_if_contradictory_equation()
+        rref.raise_exception_if_too_few_pivots()
+
+        num_variables = rref.dimension
+        solution_coordinates = [rref.planes[i].constant_term for i in range(num_variables)]
+        return Vector(solution_coordinates)
+
+
+    # 大型稠密方程组：以 float 运算做分块消元，剩余子矩阵的更新在多个 worker 上并行
+    def compute_solution_blocked(self, workers=1, block_size=64, executor='process'):
+        from .blocked_elimination import BlockedEliminator
+
+        with BlockedEliminator(workers=workers, block_size=block_size, executor=executor) as eliminator:
+            return eliminator.solve(self)
+
+
+    def raise_exception_if_contradictory_equation(self):
+        for p in self.planes:
+            try:
+                p.first_nonzero_index(p.normal_vector)
+
+            except Exception as e:
+                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
+                    constant_term = MyDecimal(p.constant_term)
+                    if not constant_term.is_near_zero():
+                        raise Exception(self.NO_SOLUTIONS_MSG)
+                else:
+                    raise e
+
+
+    def raise_exception_if_too_few_pivots(self):
+        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
+        num_pivots = sum([1 if index >= 0 else 0 for index in pivot_indices])
+        num_variables = self.dimension
+
+        if num_pivots < num_variables:
+            raise Exception(self.INF_SOLUTIONS_MSG)
+
+
+    '''
+        对系数矩阵做一次部分主元消元 (不含常数项)，
+        结果按 (tolerance, use_float) 缓存，供 rank/determinant/nullspace 共用。
+        缓存与各平面法向量的快照绑定：planes 列表或其中的平面被直接改动后，
+        快照不再相等，缓存随即作废。
+        use_float=True 时改用 float 运算，速度更快但不再精确。
+
+        stop_at_deficiency=True 时，一旦能断定矩阵不满秩就提前停止；
+        这种不完整的结果不写入缓存。
+
+        返回 (rows, pivot_columns, sign, complete)：
+        rows 为消元后的行阶梯形式，sign 为行交换带来的行列式符号。
+    '''
+    def _eliminate(self, tolerance=1e-10, use_float=False, stop_at_deficiency=False):
+        snapshot = tuple(p.normal_vector.coordinates for p in self.planes)
+        if snapshot != self._elimination_snapshot:
+            self._elimination_cache = {}
+            self._elimination_snapshot = snapshot
+
+        key = (tolerance, use_float)
+        cached = self._elimination_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if use_float:
+            rows = [[float(x) for x in p.normal_vector.coordinates] for p in self.planes]
+        else:
+            rows = [list(p.normal_vector.coordinates) for p in self.planes]
+
+        num_rows = len(rows)
+        num_cols = self.dimension
+        full_rank = min(num_rows, num_cols)
+        pivot_columns = []
+        sign = 1
+        r = 0
+
+        for col in range(num_cols):
+            if r == num_rows:
+                break
+
+            pivot_row = max(range(r, num_rows), key=lambda k: abs(rows[k][col]))
+            if abs(rows[pivot_row][col]) < tolerance:
+                # 剩余的行和列已不足以补齐秩
+                if stop_at_deficiency and r + min(num_rows - r, num_cols - col - 1) < full_rank:
+                    return rows, pivot_columns, sign, False
+                continue
+
+            if pivot_row != r:
+                rows[r], rows[pivot_row] = rows[pivot_row], rows[r]
+                sign = -sign
+
+            pivot = rows[r]
+            for k in range(r+1, num_rows):
+                row = rows[k]
+                factor = row[col] / pivot[col]
+                if not factor:
+                    continue
+                row[col] = row[col] * 0
+                for j in range(col+1, num_cols):
+                    row[j] -= factor * pivot[j]
+
+            pivot_columns.append(col)
+            r += 1
+
+        result = (rows, pivot_columns, sign, True)
+        self._elimination_cache[key] = result
+        return result
+
+
+    def rank(self, tolerance=1e-10, use_float=False):
+        _, pivot_columns, _, _ = self._eliminate(tolerance, use_float)
+        return len(pivot_columns)
+
+
+    # 是否满秩；一旦证明不满秩即提前返回
+    def has_full_rank(self, tolerance=1e-10, use_float=False):
+        _, pivot_columns, _, complete = self._eliminate(tolerance, use_float,
+                                                        stop_at_deficiency=True)
+        return complete and len(pivot_columns) == min(len(self), self.dimension)
+
+
+    # 系数矩阵的行列式，仅对方程个数等于未知数个数的方程组有定义
+    def determinant(self, tolerance=1e-10, use_float=False):
+        if len(self) != self.dimension:
+            raise Exception(self.DETERMINANT_REQUIRES_SQUARE_SYSTEM_MSG)
+
+        rows, pivot_columns, sign, complete = self._eliminate(tolerance, use_float,
+                                                              stop_at_deficiency=True)
+        if not complete or len(pivot_columns) < self.dimension:
+            return 0.0 if use_float else Decimal(0)
+
+        det = rows[0][0] * sign
+        for i in range(1, self.dimension):
+            det *= rows[i][i]
+        return det
+
+
+    # 齐次方程组 Ax = 0 的解空间的一组基
+    def nullspace(self, tolerance=1e-10, use_float=False):
+        rows, pivot_columns, _, _ = self._eliminate(tolerance, use_float)
+        rows = [list(row) for row in rows[:len(pivot_columns)]]
+        num_cols = self.dimension
+
+        # 回代得到简化行阶梯形式
+        for i in range(len(pivot_columns))[::-1]:
+            col = pivot_columns[i]
+            pivot = rows[i][col]
+            rows[i] = [x / pivot for x in rows[i]]
+            for k in range(i):
+                factor = rows[k][col]
+                if factor:
+                    rows[k] = [a - factor * b for a, b in zip(rows[k], rows[i])]
+
+        one = 1.0 if use_float else Decimal(1)
+        zero = one * 0
+        basis = []
+        for free in range(num_cols):
+            if free in pivot_columns:
+                continue
+            coordinates = [zero] * num_cols
+            coordinates[free] = one
+            for i, col in enumerate(pivot_columns):
+                coordinates[col] = -rows[i][free]
+            basis.append(Vector(coordinates))
+
+        return basis
+
+
+    def indices_of_first_nonzero_terms_in_each_row(self):
+        num_equations = len(self)
+        num_variables = self.dimension
+
+        indices = [-1] * num_equations
+
+        for i,p in enumerate(self.planes):
+            try:
+                indices[i] = p.first_nonzero_index(p.normal_vector)
+            except Exception as e:
+                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
+                    continue
+                else:
+                    raise e
+
+        return indices
+
+
+    def __len__(self):
+        return len(self.planes)
+
+
+    def __getitem__(self, i):
+        return self.planes[i]
+
+
+    def __setitem__(self, i, x):
+        try:
+            assert x.dimension == self.dimension
+            self.planes[i] = x
+            self._elimination_cache = {}
+
+        except AssertionError:
+            raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+
+    def __str__(self):
+        ret = 'Linear System:\n'
+        temp = ['Equation {}: {}'.format(i+1,p) for i,p in enumerate(self.planes)]
+        ret += '\n'.join(temp)
+        return ret
+
+
+class MyDecimal(Decimal):
+    def is_near_zero(self, eps=1e-10):
+        return abs(self) < eps
+
+if __name__ == '__main__':
+
+    from decimal import getcontext
+    from .vector import DECIMAL_PRECISION
+    getcontext().prec = DECIMAL_PRECISION
+
+    p0 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+    p1 = Plane(normal_vector=Vector(['0','1','0']), constant_term='2')
+    p2 = Plane(normal_vector=Vector(['1','1','-1']), constant_term='3')
+    p3 = Plane(normal_vector=Vector(['1','0','-2']), constant_term='2')
+
+    s = LinearSystem([p0,p1,p2,p3])
+
+    print(s.indices_of_first_nonzero_terms_in_each_row())
+    print('{},{},{},{}'.format(s[0],s[1],s[2],s[3]))
+    print(len(s))
+    print(s)
+
+    s[0] = p1
+    print(s)
+
+    print(MyDecimal('1e-9').is_near_zero())
+    print(MyDecimal('1e-11').is_near_zero())
+
+
+    print('#############################')
+
+    p0 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+    p1 = Plane(normal_vector=Vector(['0','1','0']), constant_term='2')
+    p2 = Plane(normal_vector=Vector(['1','1','-1']), constant_term='3')
+    p3 = Plane(normal_vector=Vector(['1','0','-2']), constant_term='2')
+
+    s = LinearSystem([p0,p1,p2,p3])
+    
+    
+    s.swap_rows(0,1)
+    if not (s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3):
+        print('test case 1 failed')
+
+    s.swap_rows(1,3)
+    if not (s[0] == p1 and s[1] == p3 and s[2] == p2 and s[3] == p0):
+        print('test case 2 failed')
+
+    s.swap_rows(3,1)
+    if not (s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3):
+        print('test case 3 failed')
+
+    s.multiply_coefficient_and_row(1,0)
+    if not (s[0] == p1 and s[1] == p0 and s[2] == p2 and s[3] == p3):
+        print('test case 4 failed')
+
+    s.multiply_coefficient_and_row(-1,2)
+    if not (s[0] == p1 and
+            s[1] == p0 and
+            s[2] == Plane(normal_vector=Vector(['-1','-1','1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 5 failed')
+
+    s.multiply_coefficient_and_row(10,1)
+    if not (s[0] == p1 and
+            s[1] == Plane(normal_vector=Vector(['10','10','10']), constant_term='10') and
+            s[2] == Plane(normal_vector=Vector(['-1','-1','1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 6 failed')
+
+    s.add_multiple_times_row_to_row(0,0,1)
+    if not (s[0] == p1 and
+            s[1] == Plane(normal_vector=Vector(['10','10','10']), constant_term='10') and
+            s[2] == Plane(normal_vector=Vector(['-1','-1','1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 7 failed')
+
+    s.add_multiple_times_row_to_row(1,0,1)
+    if not (s[0] == p1 and
+            s[1] == Plane(normal_vector=Vector(['10','11','10']), constant_term='12') and
+            s[2] == Plane(normal_vector=Vector(['-1','-1','1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 8 failed')
+
+    s.add_multiple_times_row_to_row(-1,1,0)
+    if not (s[0] == Plane(normal_vector=Vector(['-10','-10','-10']), constant_term='-10') and
+            s[1] == Plane(normal_vector=Vector(['10','11','10']), constant_term='12') and
+            s[2] == Plane(normal_vector=Vector(['-1','-1','1']), constant_term='-3') and
+            s[3] == p3):
+        print('test case 9 failed')
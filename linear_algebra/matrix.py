@@ -0,0 +1,219 @@
+# -*- coding:utf-8 -*-
+
+from decimal import Decimal
+
+from .vector import Vector
+from .vector_array import VectorArray
+from .buffers import buffer_tolist, float_array, to_ndarray
+
+
+# 分块乘法内核：a 为 n 行 m 列，b 为 m 行 p 列，均以行序列给出。
+# 按 block_size 切分 i、k、j 三个维度，使内层循环反复使用同一小块的行，
+# 提高缓存命中率。zero 决定累加的数值类型 (Decimal 或 float)。
+def _blocked_matmul(a, b, p, block_size, zero):
+    n, m = len(a), len(b)
+    c = [[zero] * p for _ in range(n)]
+
+    for ii in range(0, n, block_size):
+        i_end = min(ii + block_size, n)
+        for kk in range(0, m, block_size):
+            k_end = min(kk + block_size, m)
+            for jj in range(0, p, block_size):
+                j_end = min(jj + block_size, p)
+                for i in range(ii, i_end):
+                    a_row = a[i]
+                    c_row = c[i]
+                    for k in range(kk, k_end):
+                        a_ik = a_row[k]
+                        if not a_ik:
+                            continue
+                        b_row = b[k]
+                        for j in range(jj, j_end):
+                            c_row[j] += a_ik * b_row[j]
+
+    return c
+
+
+class Matrix(object):
+    '''
+        稠密矩阵。元素与 Vector 一样以 Decimal 保存，
+        按 (行步长, 列步长) 索引一段平铺的存储，
+        因此转置只需交换步长，不复制数据。
+    '''
+
+    DEFAULT_BLOCK_SIZE = 32
+
+    MATRIX_MUST_BE_NONEMPTY_MSG = 'The matrix must be nonempty'
+    ROWS_MUST_HAVE_SAME_LENGTH_MSG = 'All rows of the matrix should have the same length'
+    DIMENSIONS_DO_NOT_MATCH_MSG = 'Matrix dimensions do not match'
+
+    # rows 可以是行序列，也可以是二维 NumPy 数组等缓冲区对象
+    def __init__(self, rows):
+        try:
+            rows = [[Decimal(x) for x in row] for row in buffer_tolist(rows)]
+            if not rows or not rows[0]:
+                raise ValueError
+
+            num_cols = len(rows[0])
+            for row in rows:
+                assert len(row) == num_cols
+
+        except ValueError:
+            raise ValueError(self.MATRIX_MUST_BE_NONEMPTY_MSG)
+
+        except AssertionError:
+            raise Exception(self.ROWS_MUST_HAVE_SAME_LENGTH_MSG)
+
+        self._data = tuple([x for row in rows for x in row])
+        self._offset = 0
+        self._strides = (num_cols, 1)
+        self.num_rows = len(rows)
+        self.num_cols = num_cols
+
+    @classmethod
+    def _view(cls, data, num_rows, num_cols, strides, offset=0):
+        m = cls.__new__(cls)
+        m._data = data
+        m._offset = offset
+        m._strides = strides
+        m.num_rows = num_rows
+        m.num_cols = num_cols
+        return m
+
+    # 以方程组各方程的法向量为行构造系数矩阵
+    @classmethod
+    def from_linear_system(cls, system):
+        return cls([p.normal_vector.coordinates for p in system.planes])
+
+    @classmethod
+    def identity(cls, n):
+        return cls([[1 if i == j else 0 for j in range(n)] for i in range(n)])
+
+    @property
+    def shape(self):
+        return (self.num_rows, self.num_cols)
+
+    def is_square(self):
+        return self.num_rows == self.num_cols
+
+    def __getitem__(self, index):
+        i, j = index
+        if i < 0:
+            i += self.num_rows
+        if j < 0:
+            j += self.num_cols
+        if not (0 <= i < self.num_rows and 0 <= j < self.num_cols):
+            raise IndexError('Matrix index out of range')
+        rs, cs = self._strides
+        return self._data[self._offset + i*rs + j*cs]
+
+    def _row(self, i):
+        rs, cs = self._strides
+        start = self._offset + i*rs
+        if cs == 1:
+            return self._data[start:start + self.num_cols]
+        return self._data[start:start + self.num_cols*cs:cs]
+
+    def _rows(self):
+        return [self._row(i) for i in range(self.num_rows)]
+
+    def row(self, i):
+        return Vector(self._row(i))
+
+    def column(self, j):
+        return self.transpose().row(j)
+
+    # 转置视图：与原矩阵共享存储
+    def transpose(self):
+        rs, cs = self._strides
+        return Matrix._view(self._data, self.num_cols, self.num_rows, (cs, rs), self._offset)
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    # 矩阵乘向量
+    def matvec(self, v):
+        if len(v) != self.num_cols:
+            raise Exception(self.DIMENSIONS_DO_NOT_MATCH_MSG)
+        x = v.coordinates if isinstance(v, Vector) else tuple([Decimal(c) for c in v])
+        return Vector([sum([a*b for a, b in zip(row, x)]) for row in self._rows()])
+
+    # 分块矩阵乘法
+    def matmul(self, other, block_size=None):
+        if self.num_cols != other.num_rows:
+            raise Exception(self.DIMENSIONS_DO_NOT_MATCH_MSG)
+        if block_size is None:
+            block_size = self.DEFAULT_BLOCK_SIZE
+        if block_size < 1:
+            raise ValueError('block_size must be at least 1')
+
+        n, p = self.num_rows, other.num_cols
+        c = _blocked_matmul(self._rows(), other._rows(), p, block_size, Decimal(0))
+
+        data = tuple([x for row in c for x in row])
+        return Matrix._view(data, n, p, (p, 1))
+
+    # 批量矩阵乘向量：把整批向量看作矩阵的列，复用分块乘法。
+    # float 后端的 VectorArray 以 float 计算并返回 float 后端的结果
+    def matvec_batch(self, vectors, block_size=None):
+        if not isinstance(vectors, VectorArray):
+            vectors = VectorArray(vectors)
+        if vectors.dimension != self.num_cols:
+            raise Exception(self.DIMENSIONS_DO_NOT_MATCH_MSG)
+        if block_size is None:
+            block_size = self.DEFAULT_BLOCK_SIZE
+
+        rows = [vectors.row(i) for i in range(len(vectors))]
+        a_t = self.transpose()._rows()
+
+        if vectors.is_float():
+            a_t = [[float(x) for x in row] for row in a_t]
+            product = _blocked_matmul(rows, a_t, self.num_rows, block_size, 0.0)
+            return VectorArray.from_buffer(float_array([x for row in product for x in row]),
+                                           self.num_rows)
+
+        product = _blocked_matmul(rows, a_t, self.num_rows, block_size, Decimal(0))
+        return VectorArray(product)
+
+    # 残差 b - Ax，用于检验方程组的解
+    def residual(self, x, b):
+        ax = self.matvec(x)
+        b = b if isinstance(b, Vector) else Vector(b)
+        return b.minus(ax)
+
+    # 供 buffer_tolist 使用，使 Matrix(matrix) 等构造保持精确
+    def _tolist(self):
+        return [list(row) for row in self._rows()]
+
+    def __array__(self, dtype=None, copy=None):
+        return to_ndarray([x for row in self._rows() for x in row], self.shape, dtype, copy)
+
+    def __eq__(self, other):
+        return self.shape == other.shape and self._rows() == other._rows()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __str__(self):
+        rows = ['  {}'.format([round(x, 3) for x in row]) for row in self._rows()]
+        return 'Matrix {}x{}:\n{}'.format(self.num_rows, self.num_cols, '\n'.join(rows))
+
+
+# 方程组的残差向量：各方程 constant_term - normal_vector . x
+def linear_system_residual(system, x):
+    a = Matrix.from_linear_system(system)
+    return a.residual(x, [p.constant_term for p in system.planes])
+
+
+if __name__ == '__main__':
+
+    a = Matrix([[1, 2, 3], [4, 5, 6]])
+    b = Matrix([[7, 8], [9, 10], [11, 12]])
+
+    print('a x b = {}'.format(a.matmul(b, block_size=2)))
+    print('a^T = {}'.format(a.T))
+    print('a . [1, 1, 1] = {}'.format(a.matvec(Vector([1, 1, 1]))))
+
+    batch = a.matvec_batch([Vector([1, 0, 0]), Vector([0, 1, 0]), Vector([0, 0, 1])])
+    print('batched matvec: {}'.format([str(v) for v in batch]))
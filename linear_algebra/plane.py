@@ -1,23 +1,22 @@
 # -*- coding:utf-8 -*- 
 
-from decimal import Decimal, getcontext
+from decimal import Decimal
 
-from vector import Vector
+from .vector import Vector
 
-getcontext().prec = 30
 
 
 class Plane(object):
 
     NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
 
+    # 维数由法向量决定，未给出法向量时为三维
     def __init__(self, normal_vector=None, constant_term=None):
-        self.dimension = 3
-
         if not normal_vector:
-            all_zeros = ['0']*self.dimension
+            all_zeros = ['0']*3
             normal_vector = Vector(all_zeros)
         self.normal_vector = normal_vector
+        self.dimension = normal_vector.dimension
 
         if not constant_term:
             constant_term = Decimal('0')
@@ -131,18 +130,22 @@ class MyDecimal(Decimal):
 
 
 if __name__ == '__main__':
+
+    from decimal import getcontext
+    from .vector import DECIMAL_PRECISION
+    getcontext().prec = DECIMAL_PRECISION
     
     p1 = Plane(Vector(['-0.412', '3.806', '0.728']), constant_term='-3.46')
     p2 = Plane(Vector(['1.03', '-9.515', '-1.82']), constant_term='8.65')
-    print 'first pair of planes are parallel?:{}'.format(p1.is_parallel_to(p2))
-    print 'first pair of planes are equal?:{}'.format(p1 == p2)
+    print('first pair of planes are parallel?:{}'.format(p1.is_parallel_to(p2)))
+    print('first pair of planes are equal?:{}'.format(p1 == p2))
     
     p1 = Plane(Vector([2.611, 5.528, 0.283]), 4.6)
     p2 = Plane(Vector([7.715, 8.306, 5.342]), 3.76)
-    print 'second pair of planes are parallel?:{}'.format(p1.is_parallel_to(p2))
-    print 'second pair of planes are equal?:{}'.format(p1 == p2)
+    print('second pair of planes are parallel?:{}'.format(p1.is_parallel_to(p2)))
+    print('second pair of planes are equal?:{}'.format(p1 == p2))
     
     p1 = Plane(Vector([-7.926, 8.625, -7.212]), -7.952)
     p2 = Plane(Vector([-2.642, 2.875, -2.404]), -2.443)
-    print 'third pair of planes are parallel?:{}'.format(p1.is_parallel_to(p2))
-    print 'third pair of planes are equal?:{}'.format(p1 == p2)
\ No newline at end of file
+    print('third pair of planes are parallel?:{}'.format(p1.is_parallel_to(p2)))
+    print('third pair of planes are equal?:{}'.format(p1 == p2))
\ No newline at end of file
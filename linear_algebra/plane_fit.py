@@ -0,0 +1,202 @@
+# -*- coding:utf-8 -*-
+
+'''
+    点云的流式最小二乘平面拟合。
+
+    PlaneFitter 只保存点数、质心和 3x3 离差矩阵 (sum (x-c)(x-c)^T)，
+    分块输入的点按 Chan 等人的并行公式合并进这些统计量，内存占用为 O(1)。
+    拟合平面的法向量是协方差矩阵最小特征值对应的特征向量，
+    平面经过质心。多个 worker 各自累积的 PlaneFitter 可以用 merge 合并。
+
+    RansacPlaneFitter 用于离群点较多的数据：它用蓄水池抽样保留固定数量的样本点，
+    在样本上做 RANSAC 找出内点，再用内点做最小二乘拟合。
+'''
+
+import random
+from math import sqrt
+
+from .vector import Vector
+from .plane import Plane
+from .eigen import jacobi_eigen
+
+
+def _as_points(points):
+    return [tuple([float(x) for x in p]) for p in points]
+
+
+class PlaneFitter(object):
+
+    TOO_FEW_POINTS_MSG = 'At least 3 points are needed to fit a plane'
+    POINTS_MUST_BE_3D_MSG = 'Plane fitting needs 3d points'
+    NO_UNIQUE_PLANE_MSG = 'The points are collinear or coincident; no unique plane fits them'
+
+    def __init__(self, points=None):
+        self.count = 0
+        self.mean = [0.0, 0.0, 0.0]
+        self.scatter = [[0.0] * 3 for _ in range(3)]
+        if points is not None:
+            self.update(points)
+
+    # 加入一块点 (Vector、坐标序列或 VectorArray)
+    def update(self, points):
+        points = _as_points(points)
+        if not points:
+            return self
+        if any([len(p) != 3 for p in points]):
+            raise Exception(self.POINTS_MUST_BE_3D_MSG)
+
+        n = len(points)
+        mean = [sum([p[k] for p in points]) / n for k in range(3)]
+        centered = [[p[k] - mean[k] for k in range(3)] for p in points]
+        scatter = [[sum([c[i] * c[j] for c in centered]) for j in range(3)] for i in range(3)]
+
+        self._combine(n, mean, scatter)
+        return self
+
+    # 合并另一个 PlaneFitter 的统计量 (例如并行 worker 的结果)
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.scatter)
+        return self
+
+    def _combine(self, n_b, mean_b, scatter_b):
+        n_a = self.count
+        n = n_a + n_b
+        delta = [mean_b[k] - self.mean[k] for k in range(3)]
+        weight = float(n_a) * n_b / n
+
+        self.scatter = [[self.scatter[i][j] + scatter_b[i][j] + delta[i] * delta[j] * weight
+                         for j in range(3)] for i in range(3)]
+        self.mean = [self.mean[k] + delta[k] * n_b / n for k in range(3)]
+        self.count = n
+
+    def centroid(self):
+        return Vector(self.mean)
+
+    def covariance(self):
+        if self.count == 0:
+            raise Exception(self.TOO_FEW_POINTS_MSG)
+        return [[x / self.count for x in row] for row in self.scatter]
+
+    # 点共线或重合时，两个最小特征值相对最大特征值都接近 0，
+    # 法向量不唯一 (同 LinearSystem.INF_SOLUTIONS_MSG)
+    def _smallest_eigenpair(self, tolerance=1e-10):
+        if self.count < 3:
+            raise Exception(self.TOO_FEW_POINTS_MSG)
+        pairs = jacobi_eigen(self.covariance())
+        if pairs[1][0] <= tolerance * pairs[2][0]:
+            raise Exception(self.NO_UNIQUE_PLANE_MSG)
+        return pairs[0]
+
+    # 拟合平面：normal_vector 为单位法向量，constant_term = normal . centroid
+    def plane(self):
+        _, normal = self._smallest_eigenpair()
+        normal = [float(x) for x in normal]
+        constant_term = sum([n * c for n, c in zip(normal, self.mean)])
+        return Plane(normal_vector=Vector(normal), constant_term=constant_term)
+
+    # 点到拟合平面距离的均方根
+    def rms_distance(self):
+        eigenvalue, _ = self._smallest_eigenpair()
+        return sqrt(max(eigenvalue, 0.0))
+
+
+class RansacPlaneFitter(object):
+    '''
+        sample_size: 蓄水池中保留的样本点数 (内存上限)
+        threshold:   点到平面的距离不超过 threshold 视为内点
+        iterations:  RANSAC 假设平面的次数
+    '''
+
+    def __init__(self, threshold, sample_size=2048, iterations=200, seed=None):
+        if threshold <= 0:
+            raise ValueError('threshold must be positive')
+        if sample_size < 3:
+            raise ValueError('sample_size must be at least 3')
+
+        self.threshold = threshold
+        self.sample_size = sample_size
+        self.iterations = iterations
+        self.count = 0
+        self.sample = []
+        self._random = random.Random(seed)
+
+    def update(self, points):
+        for p in _as_points(points):
+            if len(p) != 3:
+                raise Exception(PlaneFitter.POINTS_MUST_BE_3D_MSG)
+            self.count += 1
+            if len(self.sample) < self.sample_size:
+                self.sample.append(p)
+            else:
+                k = self._random.randrange(self.count)
+                if k < self.sample_size:
+                    self.sample[k] = p
+        return self
+
+    # 按两边各自代表的点数比例，从两个蓄水池中不放回地抽取合并后的样本
+    def merge(self, other):
+        ours, theirs = list(self.sample), list(other.sample)
+        n_ours, n_theirs = self.count, other.count
+        merged = []
+
+        while len(merged) < self.sample_size and (ours or theirs):
+            total = n_ours + n_theirs
+            if theirs and (not ours or self._random.random() * total >= n_ours):
+                merged.append(theirs.pop(self._random.randrange(len(theirs))))
+                n_theirs -= 1
+            else:
+                merged.append(ours.pop(self._random.randrange(len(ours))))
+                n_ours -= 1
+
+        self.sample = merged
+        self.count += other.count
+        return self
+
+    def _inliers(self, normal, constant_term):
+        return [p for p in self.sample
+                if abs(sum([n * x for n, x in zip(normal, p)]) - constant_term) <= self.threshold]
+
+    def plane(self):
+        if len(self.sample) < 3:
+            raise Exception(PlaneFitter.TOO_FEW_POINTS_MSG)
+
+        best = []
+        for _ in range(self.iterations):
+            a, b, c = self._random.sample(self.sample, 3)
+            u = [b[k] - a[k] for k in range(3)]
+            v = [c[k] - a[k] for k in range(3)]
+            normal = [u[1]*v[2] - u[2]*v[1], u[2]*v[0] - u[0]*v[2], u[0]*v[1] - u[1]*v[0]]
+            length = sqrt(sum([x*x for x in normal]))
+            if length == 0:
+                continue
+            normal = [x / length for x in normal]
+            inliers = self._inliers(normal, sum([n * x for n, x in zip(normal, a)]))
+            if len(inliers) > len(best):
+                best = inliers
+
+        if len(best) < 3:
+            raise Exception(PlaneFitter.TOO_FEW_POINTS_MSG)
+        return PlaneFitter(best).plane()
+
+
+if __name__ == '__main__':
+
+    rng = random.Random(1)
+
+    # z = 0.5x - 0.25y + 2 附近的点
+    def sample_points(n):
+        return [(x, y, 0.5*x - 0.25*y + 2 + rng.gauss(0, 0.01))
+                for x, y in [(rng.uniform(-10, 10), rng.uniform(-10, 10)) for _ in range(n)]]
+
+    first, second = PlaneFitter(), PlaneFitter()
+    for _ in range(10):
+        first.update(sample_points(100))
+        second.update(sample_points(100))
+    fitted = first.merge(second)
+    print('least squares: {} (rms {:.4f})'.format(fitted.plane(), fitted.rms_distance()))
+
+    ransac = RansacPlaneFitter(threshold=0.05, seed=1)
+    ransac.update(sample_points(500))
+    ransac.update([(rng.uniform(-10, 10), rng.uniform(-10, 10), rng.uniform(-50, 50)) for _ in range(500)])
+    print('ransac: {}'.format(ransac.plane()))
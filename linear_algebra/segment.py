@@ -0,0 +1,391 @@
+# -*- coding:utf-8 -*-
+
+'''
+    线段，以及求一组线段全部交点的扫描线算法 (Bentley-Ottmann)。
+
+    Segment 由两个端点和所在直线 (Line) 组成。segment_intersections
+    用一条竖直扫描线从左向右扫过平面，复杂度 O((n + k) log n)，
+    k 为交点个数：
+      - 事件队列是按 (x, y) 排序的堆，初始只含全部端点；
+      - 扫描线状态是与扫描线相交的线段，按交点的 y 坐标排好序，存放在 treap
+        (随机优先级的平衡二叉树) 中，每个事件按点拆分、合并，期望 O(log n)；
+      - 只检查状态中相邻线段的交点，并在两条线段不再相邻时把它们的交点
+        从队列中撤销，因此队列始终只有 O(n) 个事件；
+      - 交点由生成器逐个产出，不会在内存中累积。
+
+    坐标本身就是精确的 Decimal，计算全部使用整数与有理数 (fractions.Fraction)：
+    端点先统一放大为整数，交点是精确的分数。多条线段交于一点、端点落在
+    另一条线段上、竖直线段、共线重叠等退化情形都不需要容差。
+'''
+
+import heapq
+import random
+from decimal import Decimal
+from fractions import Fraction
+from math import gcd
+
+from .vector import Vector
+from .line import Line
+
+ONLY_DEFINED_IN_TWO_DIMS_MSG = 'Segments are only defined in 2d'
+ZERO_LENGTH_SEGMENT_MSG = 'The endpoints of a segment must be distinct'
+
+
+def _exact(x):
+    x = Fraction(x)
+    return x.numerator if x.denominator == 1 else x
+
+
+def _point(vector):
+    if vector.dimension != 2:
+        raise Exception(ONLY_DEFINED_IN_TWO_DIMS_MSG)
+    return (_exact(vector[0]), _exact(vector[1]))
+
+
+def _to_vector(point):
+    return Vector([Decimal(x.numerator) / Decimal(x.denominator) for x in point])
+
+
+def _ratio(numerator, denominator):
+    return _exact(Fraction(numerator, denominator))
+
+
+# (b - a) x (c - a) 的符号：c 在有向线段 ab 左侧为正，右侧为负，共线为零。
+# c 的坐标可以是分数，先乘以两个分母 (正数) 再用整数计算
+def _orientation(a, b, c):
+    x, y = c
+    return ((b[0] - a[0]) * (y.numerator - a[1] * y.denominator) * x.denominator
+            - (b[1] - a[1]) * (x.numerator - a[0] * x.denominator) * y.denominator)
+
+
+# 两条线段的交：None、一个点，或共线重叠部分的两个端点 (按字典序)
+def _intersect(p1, q1, p2, q2):
+    d1 = (q1[0] - p1[0], q1[1] - p1[1])
+    d2 = (q2[0] - p2[0], q2[1] - p2[1])
+    offset = (p2[0] - p1[0], p2[1] - p1[1])
+    denominator = d1[0] * d2[1] - d1[1] * d2[0]
+    t = offset[0] * d2[1] - offset[1] * d2[0]
+    u = offset[0] * d1[1] - offset[1] * d1[0]
+
+    if denominator != 0:
+        # 交点参数为 t/denominator 与 u/denominator，都需要落在 [0, 1] 内
+        if denominator < 0:
+            denominator, t, u = -denominator, -t, -u
+        if not (0 <= t <= denominator and 0 <= u <= denominator):
+            return None
+        if t == 0:
+            return p1
+        if t == denominator:
+            return q1
+        return (_ratio(p1[0] * denominator + t * d1[0], denominator),
+                _ratio(p1[1] * denominator + t * d1[1], denominator))
+
+    if u != 0:
+        # 平行但不共线
+        return None
+
+    start, end = max(min(p1, q1), min(p2, q2)), min(max(p1, q1), max(p2, q2))
+    if start > end:
+        return None
+    if start == end:
+        return start
+    return (start, end)
+
+
+class Segment(object):
+    '''
+        start, end: 端点 (Vector)，顺序不影响线段本身
+        line:       线段所在的直线
+    '''
+
+    def __init__(self, start, end):
+        self._start, self._end = _point(start), _point(end)
+        if self._start == self._end:
+            raise Exception(ZERO_LENGTH_SEGMENT_MSG)
+
+        self.start = start
+        self.end = end
+        self.dimension = 2
+
+        # 法向量 (dy, -dx)，常数项 n.start
+        normal_vector = Vector([end[1] - start[1], start[0] - end[0]])
+        self.line = Line(normal_vector, normal_vector.dot(start))
+
+    def __str__(self):
+        return 'Segment: {} -> {}'.format(
+            [round(coord, 3) for coord in self.start.coordinates],
+            [round(coord, 3) for coord in self.end.coordinates])
+
+    def length(self):
+        return self.end.minus(self.start).magnitude()
+
+    def contains(self, point):
+        point = _point(point)
+        return _intersect(self._start, self._end, point, point) is not None
+
+    # 相交：返回交点 (Vector)、重叠部分 (Segment) 或 None
+    def intersection_with(self, s):
+        result = _intersect(self._start, self._end, s._start, s._end)
+        if result is None:
+            return None
+        if isinstance(result[0], tuple):
+            return Segment(_to_vector(result[0]), _to_vector(result[1]))
+        return _to_vector(result)
+
+
+class _SweepSegment(object):
+
+    def __init__(self, index, segment, scale):
+        self.index = index
+        self.segment = segment
+        self.p, self.q = sorted([(_exact(x * scale), _exact(y * scale))
+                                 for x, y in (segment._start, segment._end)])
+        dx, dy = self.q[0] - self.p[0], self.q[1] - self.p[1]
+        self.vertical = dx == 0
+        # 经过同一点的线段在扫描线刚越过该点时按斜率排序，竖直线段在最上方
+        self.slope = (1, 0) if self.vertical else (0, Fraction(dy) / dx)
+
+    # 点相对线段的位置：-1 在下方，0 在线段上，1 在上方。
+    # 只对与扫描线相交的线段调用；竖直线段只可能在它自己的 x 上仍在状态中
+    def side_of(self, point):
+        if self.vertical:
+            return 0
+        o = _orientation(self.p, self.q, point)
+        return (o > 0) - (o < 0)
+
+
+class _EventQueue(object):
+
+    # 每个事件点记录“理由”的个数：端点各算一个，仍然相邻的线段对各算一个。
+    # 理由减为零的交点被撤销，堆中残留的条目在出队时跳过，并定期清理
+    def __init__(self):
+        self._heap = []
+        self._reasons = {}
+
+    def __len__(self):
+        return len(self._reasons)
+
+    def add(self, point):
+        count = self._reasons.get(point, 0)
+        if not count:
+            heapq.heappush(self._heap, point)
+        self._reasons[point] = count + 1
+
+    def discard(self, point):
+        count = self._reasons.get(point)
+        if count is None:
+            return
+        if count > 1:
+            self._reasons[point] = count - 1
+            return
+        del self._reasons[point]
+        if len(self._heap) > 2 * len(self._reasons) + 64:
+            self._heap = [p for p in self._heap if p in self._reasons]
+            heapq.heapify(self._heap)
+
+    def pop(self):
+        while self._heap:
+            point = heapq.heappop(self._heap)
+            if self._reasons.pop(point, None):
+                return point
+        return None
+
+
+class _Node(object):
+
+    def __init__(self, segment, priority):
+        self.segment = segment
+        self.priority = priority
+        self.left = None
+        self.right = None
+
+
+# treap 上的操作：按中序排列的线段即扫描线状态，期望深度 O(log n)。
+# 按单调谓词拆分：左边是谓词为真的前缀
+def _split(node, predicate):
+    if node is None:
+        return None, None
+    if predicate(node.segment):
+        node.right, right = _split(node.right, predicate)
+        return node, right
+    left, node.left = _split(node.left, predicate)
+    return left, node
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return left
+    right.left = _merge(left, right.left)
+    return right
+
+
+def _segments(node):
+    result = []
+    stack = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        result.append(node.segment)
+        node = node.right
+    return result
+
+
+def _first(node):
+    if node is None:
+        return None
+    while node.left is not None:
+        node = node.left
+    return node.segment
+
+
+def _last(node):
+    if node is None:
+        return None
+    while node.right is not None:
+        node = node.right
+    return node.segment
+
+
+class _SweepStatus(object):
+
+    def __init__(self, queue):
+        self.queue = queue
+        self._root = None
+        self._pending = {}
+        self._random = random.Random(0)
+
+    # 处理事件点 point：取出经过 point 的线段 (按状态中的顺序) 并返回，
+    # 把其中不在 point 结束的线段与从 point 开始的线段 starting 按斜率重新插入；
+    # 撤销不再相邻的线段对的交点，并检查新的相邻线段对
+    def replace_through(self, point, starting):
+        below, rest = _split(self._root, lambda s: s.side_of(point) > 0)
+        middle, above = _split(rest, lambda s: s.side_of(point) >= 0)
+        through = _segments(middle)
+        lower, upper = _last(below), _first(above)
+
+        run = starting + [s for s in through if s.q != point]
+        run.sort(key=lambda s: s.slope)
+
+        chain = [s for s in [lower] + through + [upper] if s is not None]
+        for first, second in zip(chain, chain[1:]):
+            self._forget(first, second)
+
+        run_root = None
+        for s in run:
+            run_root = _merge(run_root, _Node(s, self._random.random()))
+        self._root = _merge(_merge(below, run_root), above)
+
+        if run:
+            self._check(lower, run[0], point)
+            self._check(run[-1], upper, point)
+        else:
+            self._check(lower, upper, point)
+        return through
+
+    def _check(self, lower, upper, point):
+        if lower is None or upper is None:
+            return
+        result = _intersect(lower.p, lower.q, upper.p, upper.q)
+        # 共线重叠的两条线段不产生新事件：重叠部分的两端本身就是端点事件
+        if result is None or isinstance(result[0], tuple) or result <= point:
+            return
+        self._pending[(lower.index, upper.index)] = result
+        self.queue.add(result)
+
+    def _forget(self, lower, upper):
+        result = self._pending.pop((lower.index, upper.index), None)
+        if result is not None:
+            self.queue.discard(result)
+
+
+# 生成器：对每个至少有两条线段经过的点，产出 (交点 Vector, 经过该点的 Segment 列表)。
+# 共线重叠的线段在重叠部分的两端各报告一次
+def segment_intersections(segments):
+    segments = list(segments)
+
+    # 所有端点乘以坐标分母的最小公倍数后都是整数，端点上的判断只涉及整数运算
+    scale = 1
+    for s in segments:
+        for x in s._start + s._end:
+            denominator = Fraction(x).denominator
+            scale = scale * denominator // gcd(scale, denominator)
+    sweep_segments = [_SweepSegment(i, s, scale) for i, s in enumerate(segments)]
+
+    queue = _EventQueue()
+    starting = {}
+    for s in sweep_segments:
+        starting.setdefault(s.p, []).append(s)
+        queue.add(s.p)
+        queue.add(s.q)
+
+    status = _SweepStatus(queue)
+    while True:
+        point = queue.pop()
+        if point is None:
+            return
+
+        upper = starting.pop(point, [])
+        through = status.replace_through(point, upper)
+
+        if len(upper) + len(through) > 1:
+            yield _to_vector((_ratio(point[0], scale), _ratio(point[1], scale))), \
+                [s.segment for s in upper + through]
+
+
+if __name__ == '__main__':
+
+    # 两条对角线交于 (1, 1)，竖直线段经过同一点，水平线段的端点落在竖直线段上
+    segments = [Segment(Vector([0, 0]), Vector([2, 2])),
+                Segment(Vector([0, 2]), Vector([2, 0])),
+                Segment(Vector([1, -1]), Vector([1, 3])),
+                Segment(Vector([-1, 2]), Vector([1, 2]))]
+
+    for point, through in segment_intersections(segments):
+        print('{} on {} segments'.format(point, len(through)))
+
+    print(segments[0].intersection_with(Segment(Vector([1, 1]), Vector([3, 3]))))
+
+    # 自检：在小网格上随机生成大量退化情形 (共享端点、竖直、水平、共线重叠)，
+    # 与逐对求交的结果逐点比较 (产出的交点是 Decimal，比较前两边做同样的转换)
+    def brute_force(segments):
+        result = {}
+        for i, a in enumerate(segments):
+            for b in segments[i+1:]:
+                found = _intersect(a._start, a._end, b._start, b._end)
+                if found is None:
+                    continue
+                for point in (found if isinstance(found[0], tuple) else (found,)):
+                    result[_point(_to_vector(point))] = frozenset([j for j, s in enumerate(segments)
+                                               if _intersect(s._start, s._end, point, point)])
+        return result
+
+    rng = random.Random(1)
+    for trial in range(300):
+        grid = rng.choice([3, 5, 10, 1000])
+        count = rng.randint(1, 25)
+        segments = []
+        while len(segments) < count:
+            a = [rng.randint(0, grid), rng.randint(0, grid)]
+            b = [rng.randint(0, grid), rng.randint(0, grid)]
+            if rng.random() < 0.2:
+                b[0] = a[0]
+            if rng.random() < 0.1:
+                b[1] = a[1]
+            if a != b:
+                divisor = rng.choice([1, 4])
+                segments.append(Segment(Vector([Decimal(x) / divisor for x in a]),
+                                        Vector([Decimal(x) / divisor for x in b])))
+
+        index = dict([(id(s), i) for i, s in enumerate(segments)])
+        swept = dict([(_point(point), frozenset([index[id(s)] for s in through]))
+                      for point, through in segment_intersections(segments)])
+        if swept != brute_force(segments):
+            raise Exception('sweep disagrees with brute force on trial {}'.format(trial))
+    print('sweep matches brute force on 300 random inputs')
@@ -0,0 +1,271 @@
+# -*- coding:utf-8 -*-
+
+'''
+    asyncio 求解服务：把 LinearSystem 求解和 Line/Plane 求交
+    包装成可 await 的调用。
+
+    并发到达的小请求会被合并成微批 (micro-batch)，整批交给
+    worker 池执行，避免 CPU 密集的 Decimal 运算阻塞事件循环。
+'''
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .line import Line
+from .linsys import LinearSystem
+from .vector import decimal_context
+
+# 放入队列通知收集协程结束
+_STOP = object()
+
+
+# 以下函数在 worker 池中执行，必须定义在模块顶层 (进程池需要 pickle)
+def _solve(system):
+    return system.compute_solution()
+
+
+def _intersect(objects):
+    if len(objects) == 2 and all(isinstance(o, Line) for o in objects):
+        return objects[0].intersection_with(objects[1])
+    return LinearSystem(list(objects)).compute_solution()
+
+
+def _run_batch(jobs):
+    results = []
+    with decimal_context():
+        for operation, argument in jobs:
+            try:
+                results.append((True, operation(argument)))
+            except Exception as e:
+                results.append((False, e))
+    return results
+
+
+class ServiceMetrics(object):
+    '''
+        计数与最大值覆盖服务的全部历史；延迟分位数只按最近 window 个请求计算，
+        因此长期运行时占用的内存是固定的。
+    '''
+
+    def __init__(self, window=10000):
+        if window < 1:
+            raise ValueError('window must be at least 1')
+        self.latencies = deque(maxlen=window)
+        self.num_requests = 0
+        self.num_batches = 0
+        self.total_batch_size = 0
+        self.max_batch_size = 0
+        self.max_latency = 0.0
+
+    def record_batch(self, size):
+        self.num_batches += 1
+        self.total_batch_size += size
+        self.max_batch_size = max(self.max_batch_size, size)
+
+    def record_latency(self, seconds):
+        self.latencies.append(seconds)
+        self.num_requests += 1
+        self.max_latency = max(self.max_latency, seconds)
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        mean_batch_size = 0.0
+        if self.num_batches:
+            mean_batch_size = float(self.total_batch_size) / self.num_batches
+
+        return {
+            'requests': self.num_requests,
+            'batches': self.num_batches,
+            'mean_batch_size': mean_batch_size,
+            'max_batch_size': self.max_batch_size,
+            'latency_p50': percentile(0.50),
+            'latency_p99': percentile(0.99),
+            'latency_max': self.max_latency,
+        }
+
+
+class SolverService(object):
+
+    SERVICE_NOT_RUNNING_MSG = 'Solver service is not running'
+
+    # max_batch_size: 每批最多请求数; max_wait: 第一个请求到达后最多等待的秒数;
+    # metrics_window: 计算延迟分位数时保留的最近请求数
+    def __init__(self, max_batch_size=32, max_wait=0.002, executor=None, max_workers=None,
+                 metrics_window=10000):
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be at least 1')
+        if max_wait < 0:
+            raise ValueError('max_wait must be non-negative')
+
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.metrics = ServiceMetrics(metrics_window)
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_workers = max_workers
+        self._queue = None
+        self._collector = None
+        self._pending_batches = set()
+
+    @property
+    def is_running(self):
+        return self._collector is not None
+
+    async def start(self):
+        if self.is_running:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._queue = asyncio.Queue()
+        self._collector = asyncio.ensure_future(self._collect())
+
+    async def close(self):
+        if not self.is_running:
+            return
+        collector, self._collector = self._collector, None
+
+        # 不取消收集协程：它收到 _STOP 时会先把手上已取出、尚未成批的请求发出去
+        self._queue.put_nowait(_STOP)
+        await collector
+
+        # 在 _STOP 之后才进入队列的请求直接在关闭前执行完
+        leftover = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                leftover.append(item)
+        if leftover:
+            self._dispatch(leftover)
+        if self._pending_batches:
+            await asyncio.gather(*self._pending_batches)
+
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def solve(self, system):
+        return await self._submit(_solve, system)
+
+    # 两条直线求交点；多个平面则组成方程组求公共点
+    async def intersect(self, first, *others):
+        return await self._submit(_intersect, (first,) + others)
+
+    async def _submit(self, operation, argument):
+        if not self.is_running:
+            raise Exception(self.SERVICE_NOT_RUNNING_MSG)
+
+        future = asyncio.get_running_loop().create_future()
+        submitted_at = time.perf_counter()
+        await self._queue.put((operation, argument, future))
+        try:
+            return await future
+        finally:
+            self.metrics.record_latency(time.perf_counter() - submitted_at)
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    self._dispatch(batch)
+                    return
+                batch.append(item)
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        task = asyncio.ensure_future(self._run(batch))
+        self._pending_batches.add(task)
+        task.add_done_callback(self._pending_batches.discard)
+
+    async def _run(self, batch):
+        self.metrics.record_batch(len(batch))
+        jobs = [(operation, argument) for operation, argument, _ in batch]
+        loop = asyncio.get_running_loop()
+
+        try:
+            results = await loop.run_in_executor(self._executor, _run_batch, jobs)
+        except Exception as e:
+            results = [(False, e)] * len(batch)
+
+        for (_, _, future), (ok, value) in zip(batch, results):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+class LocalClient(object):
+    '''
+        本地替身客户端：与网络客户端接口一致，但直接调用进程内的服务，
+        便于在没有网络的环境下测试。
+    '''
+
+    def __init__(self, service):
+        self.service = service
+
+    async def solve(self, system):
+        return await self.service.solve(system)
+
+    async def intersect(self, first, *others):
+        return await self.service.intersect(first, *others)
+
+    async def solve_many(self, systems):
+        return await asyncio.gather(*[self.solve(s) for s in systems],
+                                    return_exceptions=True)
+
+
+if __name__ == '__main__':
+
+    from .vector import Vector
+    from .plane import Plane
+
+    async def demo():
+        p0 = Plane(normal_vector=Vector(['1','1','1']), constant_term='6')
+        p1 = Plane(normal_vector=Vector(['0','1','1']), constant_term='5')
+        p2 = Plane(normal_vector=Vector(['0','0','1']), constant_term='3')
+        s = LinearSystem([p0,p1,p2])
+
+        async with SolverService(max_batch_size=16, max_wait=0.005) as service:
+            client = LocalClient(service)
+            solutions = await client.solve_many([s] * 50)
+            print('solution: {}'.format(solutions[0]))
+
+            line1 = Line(Vector([7.204, 3.182]), 8.68)
+            line2 = Line(Vector([8.172, 4.114]), 9.883)
+            print('intersection: {}'.format(await client.intersect(line1, line2)))
+
+        print('metrics: {}'.format(service.metrics.summary()))
+
+    asyncio.run(demo())
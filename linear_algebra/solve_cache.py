@@ -0,0 +1,215 @@
+# -*- coding:utf-8 -*-
+
+'''
+    LinearSystem 求解结果的内容寻址缓存。
+
+    缓存键是方程组的规范指纹：每个方程除以其第一个非零系数
+    (first_nonzero_index 处)，所有系数和常数项按 tolerance 量化为整数，
+    再把各行排序后取 SHA-256。因此重复提交的方程组、各方程乘以非零常数
+    或调换方程顺序后的方程组，都会命中同一条缓存。
+
+    缓存分两级：内存中的 LRU，以及可选的本地目录 (每个键一个 JSON 文件)。
+'''
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from decimal import Decimal
+
+from .vector import Vector
+from .plane import Plane
+from .linsys import LinearSystem
+
+_SOLUTION = 'solution'
+_NO_SOLUTIONS = 'no_solutions'
+_INF_SOLUTIONS = 'inf_solutions'
+
+
+def _canonical_row(plane, tolerance):
+    coefficients = plane.normal_vector.coordinates
+    constant_term = plane.constant_term
+
+    try:
+        lead = Plane.first_nonzero_index(coefficients)
+        scale = coefficients[lead]
+    except Exception as e:
+        if str(e) != Plane.NO_NONZERO_ELTS_FOUND_MSG:
+            raise e
+        # 0 = c：只区分 c 是否为零
+        scale = constant_term if abs(constant_term) >= tolerance else Decimal(1)
+
+    return tuple([int((x / scale / tolerance).to_integral_value())
+                  for x in coefficients + (constant_term,)])
+
+
+def fingerprint(system, tolerance=1e-10):
+    tolerance = Decimal(str(tolerance))
+    rows = sorted([_canonical_row(p, tolerance) for p in system.planes])
+    material = '{}|{}'.format(system.dimension, ';'.join([','.join(map(str, row)) for row in rows]))
+    return hashlib.sha256(material.encode('ascii')).hexdigest()
+
+
+class CacheStatistics(object):
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def lookups(self):
+        return self.memory_hits + self.disk_hits + self.misses
+
+    def hit_rate(self):
+        if not self.lookups:
+            return 0.0
+        return float(self.memory_hits + self.disk_hits) / self.lookups
+
+    def summary(self):
+        return {
+            'lookups': self.lookups,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate(),
+        }
+
+
+class SolveCache(object):
+    '''
+        capacity:  内存 LRU 中保留的条目数
+        directory: 磁盘缓存目录，None 表示只使用内存
+        tolerance: 指纹量化的步长，应与求解时判断零的容差一致
+        solver:    未命中时调用的求解函数，默认为 LinearSystem.compute_solution
+    '''
+
+    def __init__(self, capacity=1024, directory=None, tolerance=1e-10, solver=None):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+
+        self.capacity = capacity
+        self.directory = directory
+        self.tolerance = tolerance
+        self.solver = solver or (lambda system: system.compute_solution())
+        self.statistics = CacheStatistics()
+        self._entries = OrderedDict()
+
+        if directory is not None and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fingerprint(self, system):
+        return fingerprint(system, self.tolerance)
+
+    # 与 compute_solution 相同：返回解向量，无解或无穷多解时抛出异常
+    def solve(self, system):
+        key = self.fingerprint(system)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.statistics.memory_hits += 1
+        else:
+            entry = self._load(key)
+            if entry is not None:
+                self.statistics.disk_hits += 1
+            else:
+                self.statistics.misses += 1
+                entry = self._compute(system)
+                self._store(key, entry)
+            self._remember(key, entry)
+
+        status, coordinates = entry
+        if status == _NO_SOLUTIONS:
+            raise Exception(LinearSystem.NO_SOLUTIONS_MSG)
+        if status == _INF_SOLUTIONS:
+            raise Exception(LinearSystem.INF_SOLUTIONS_MSG)
+        return Vector(coordinates)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _compute(self, system):
+        try:
+            solution = self.solver(system)
+        except Exception as e:
+            if str(e) == LinearSystem.NO_SOLUTIONS_MSG:
+                return (_NO_SOLUTIONS, None)
+            if str(e) == LinearSystem.INF_SOLUTIONS_MSG:
+                return (_INF_SOLUTIONS, None)
+            raise e
+        return (_SOLUTION, solution.coordinates)
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.statistics.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                record = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        # 结构不对的记录 (被截断、手工改过或来自其他程序) 按未命中处理
+        if not isinstance(record, dict):
+            return None
+        status = record.get('status')
+        if status in (_NO_SOLUTIONS, _INF_SOLUTIONS):
+            return (status, None)
+        coordinates = record.get('coordinates')
+        if (status != _SOLUTION or not isinstance(coordinates, list) or not coordinates
+                or not all([isinstance(x, str) for x in coordinates])):
+            return None
+        try:
+            return (status, tuple([Decimal(x) for x in coordinates]))
+        except ArithmeticError:
+            return None
+
+    # 先写临时文件再改名，避免并发读到写了一半的文件
+    def _store(self, key, entry):
+        if self.directory is None:
+            return
+        status, coordinates = entry
+        record = {'status': status}
+        if coordinates is not None:
+            record['coordinates'] = [str(x) for x in coordinates]
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(record, f)
+            os.replace(temp_path, self._path(key))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+if __name__ == '__main__':
+
+    p0 = Plane(normal_vector=Vector(['1','1','1']), constant_term='6')
+    p1 = Plane(normal_vector=Vector(['0','1','1']), constant_term='5')
+    p2 = Plane(normal_vector=Vector(['0','0','1']), constant_term='3')
+
+    cache = SolveCache(capacity=16)
+    print('solution: {}'.format(cache.solve(LinearSystem([p0, p1, p2]))))
+
+    # 方程乘以常数并调换顺序后命中缓存
+    p1_scaled = Plane(normal_vector=Vector(['0','-2','-2']), constant_term='-10')
+    print('solution: {}'.format(cache.solve(LinearSystem([p2, p1_scaled, p0]))))
+    print('statistics: {}'.format(cache.statistics.summary()))
@@ -1,10 +1,21 @@
 # -*- coding:utf-8 -*- 
 
 from math import acos, sqrt, pi
-from decimal import Decimal, getcontext
+from decimal import Decimal, getcontext, localcontext
 
-# decimal.getcontext().prec 来设定小数点精度(默认为28)：
-getcontext().prec = 30
+from .buffers import buffer_tolist, float_array, to_ndarray
+
+# 默认的小数精度 (decimal 默认为28)
+DECIMAL_PRECISION = 30
+
+
+# 在局部上下文中设定小数精度，不修改全局的 decimal 上下文：
+#     with decimal_context():
+#         ...
+def decimal_context(prec=DECIMAL_PRECISION):
+    context = getcontext().copy()
+    context.prec = prec
+    return localcontext(context)
 
 
 class Vector(object):
@@ -14,8 +25,10 @@ class Vector(object):
     NO_UNIQUE_PARALLEL_COMPONENT_MSG = 'No unique parallel component'
     ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG = 'Cross function is only defined for 2d and 3d'
 
+    # coordinates 也可以是 NumPy 数组、array.array 等支持缓冲区协议的对象
     def __init__(self, coordinates):
         try:
+            coordinates = buffer_tolist(coordinates)
             if not coordinates:
                 raise ValueError
             self.coordinates = tuple([Decimal(x) for x in coordinates])
@@ -33,22 +46,24 @@ class Vector(object):
         return 'Vector: {}'.format([round(coord, 3) for coord in self.coordinates])
     
     def __iter__(self):
-        self.current = 0
-        return self
-    
-    def next(self):
-        if self.current >= len(self.coordinates):
-            raise StopIteration
-        else:
-            current_value = self.coordinates[self.current]
-            self.current += 1
-            return current_value    
-    
+        return iter(self.coordinates)
+
     def __len__(self):
         return len(self.coordinates)
 
     def __getitem__(self, i):
         return self.coordinates[i]    
+
+    # 供 buffer_tolist 使用：保留 Decimal 精度，不经由 float64 缓冲区
+    def _tolist(self):
+        return list(self.coordinates)
+
+    # 以 float64 形式对外暴露坐标 (Decimal 存储，需复制一次)
+    def __buffer__(self, flags):
+        return memoryview(float_array(self.coordinates))
+
+    def __array__(self, dtype=None, copy=None):
+        return to_ndarray(self.coordinates, (self.dimension,), dtype, copy)
     
     # 判断相等
     def __eq__(self, v):
@@ -65,7 +80,7 @@ class Vector(object):
 
     def plus(self, v):
         # return Vector([x+y for x,y in zip(self.coordinates, v.coordinates)])
-        return Vector(map(sum, zip(self.coordinates, v.coordinates)))
+        return Vector(list(map(sum, zip(self.coordinates, v.coordinates))))
 
     def minus(self, v):
         return Vector([x-y for x,y in zip(self.coordinates, v.coordinates)])
@@ -81,7 +96,7 @@ class Vector(object):
             # return self.times_scalar(1./self.magnitude())
             return self.times_scalar(Decimal('1.0') / self.magnitude())
         except ZeroDivisionError:
-            raise Exception(CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
+            raise Exception(self.CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
 
     # 点积
     def dot(self, v):
@@ -142,20 +157,17 @@ class Vector(object):
     
     # 计算叉积
     def cross(self, v):
-        try:
-            x_1, y_1, z_1 = self.coordinates
-            x_2, y_2, z_2 = v.coordinates
-            return Vector([y_1 * z_2 - y_2 * z_1, -(x_1 * z_2 - x_2 * z_1), x_1 * y_2 - x_2 * y_1])
-        except ValueError as e:
-            msg = str(e)
-            if msg == 'need more than 2 values to unpack':
-                self_embedded_in_R3 = Vector(self.coordinates + ('0',))
-                v_embedded_in_R3 = Vector(v.coordinates + ('0',))
-                return self_embedded_in_R3.cross(v_embedded_in_R3)
-            elif msg == 'too many values to unpack' or msg == 'need more than value to unpack':
-                raise Exception(self.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
-            else:
-                raise e
+        if self.dimension not in (2, 3) or v.dimension not in (2, 3):
+            raise Exception(self.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
+
+        if self.dimension == 2 or v.dimension == 2:
+            self_embedded_in_R3 = Vector(self.coordinates + ('0',) * (3 - self.dimension))
+            v_embedded_in_R3 = Vector(v.coordinates + ('0',) * (3 - v.dimension))
+            return self_embedded_in_R3.cross(v_embedded_in_R3)
+
+        x_1, y_1, z_1 = self.coordinates
+        x_2, y_2, z_2 = v.coordinates
+        return Vector([y_1 * z_2 - y_2 * z_1, -(x_1 * z_2 - x_2 * z_1), x_1 * y_2 - x_2 * y_1])
     
     # 计算平行四边形面积
     def area_of_parallelogram_with(self, v):
@@ -167,55 +179,57 @@ class Vector(object):
 
 if __name__ == '__main__':
 
-    print '判断两个向量是否相等:'
+    getcontext().prec = DECIMAL_PRECISION
+
+    print('判断两个向量是否相等:')
     v = Vector([1,2,3])
     w = Vector([1,2,3])
-    print v	== w
-    print '\r\n'
+    print(v	== w)
+    print('\r\n')
 
-    print '向量相加:'
+    print('向量相加:')
     v = Vector([8.218, -9.341])
     w = Vector([-1.129, 2.111])
     addition = v.plus(w)
-    print 'addition: {}'.format(addition)
-    print '\r\n'
+    print('addition: {}'.format(addition))
+    print('\r\n')
     
-    print '向量相减:'
+    print('向量相减:')
     v = Vector([7.119, 8.215])
     w = Vector([-8.223, 0.878])
     subtraction = v.minus(w)
-    print 'subtraction: {}'.format(subtraction)
-    print '\r\n'
+    print('subtraction: {}'.format(subtraction))
+    print('\r\n')
 
-    print '与标量相乘:'
+    print('与标量相乘:')
     v = Vector([1.671, -1.012, -0.318])
     multiplication = v.times_scalar(7.41)
-    print 'multiplication: {}'.format(multiplication)
-    print '\r\n'
+    print('multiplication: {}'.format(multiplication))
+    print('\r\n')
 
-    print '计算长度:'
+    print('计算长度:')
     v = Vector([-0.221, 7.437])
     w = Vector([8.813, -1.331, -6.247])
     
     first_magintude = v.magnitude()
-    print 'first_magintude: {}'.format(round(first_magintude, 3))
+    print('first_magintude: {}'.format(round(first_magintude, 3)))
     
     second_magintude = w.magnitude()
-    print 'second_magintude: {}'.format(round(second_magintude, 3))
-    print '\r\n'
+    print('second_magintude: {}'.format(round(second_magintude, 3)))
+    print('\r\n')
 
-    print '向量标准化:'
+    print('向量标准化:')
     v = Vector([5.581, -2.136])
     w = Vector([1.996, 3.108, -4.554])
     
     first_normalization = v.normalized()
-    print 'first_normailization: {}'.format(first_normalization)
+    print('first_normailization: {}'.format(first_normalization))
 
     second_normalization = w.normalized()
-    print 'second_normailization: {}'.format(second_normalization)
-    print '\r\n'
+    print('second_normailization: {}'.format(second_normalization))
+    print('\r\n')
     
-    print '求 v, w 点积:'
+    print('求 v, w 点积:')
     v1 = Vector([7.887, 4.138])
     w1 = Vector([-8.802, 6.776])
     
@@ -223,28 +237,28 @@ if __name__ == '__main__':
     w2 = Vector([-4.496, -8.755, 7.103])
     
     dot = v1.dot(w1)
-    print 'first_dot: {}'.format(round(dot, 3))
+    print('first_dot: {}'.format(round(dot, 3)))
 
     dot = v2.dot(w2)
-    print 'second_dot: {}'.format(round(dot, 3))
-    print '\r\n'
+    print('second_dot: {}'.format(round(dot, 3)))
+    print('\r\n')
     
-    print '求 v, w 夹角, 单位rad:'
+    print('求 v, w 夹角, 单位rad:')
     v = Vector(['3.183', '-7.627'])
     w = Vector(['-2.668', '5.319'])
     
     angle_rads = v.angle_with(w)
-    print 'first_angle_rads: {}'.format(angle_rads)
-    print '\r\n'
+    print('first_angle_rads: {}'.format(angle_rads))
+    print('\r\n')
     
-    print '求 v, w 夹角, 单位度:'
+    print('求 v, w 夹角, 单位度:')
     v = Vector([7.35, 0.221, 5.188])
     w = Vector([2.751, 8.259, 3.985])
     angle_degrees = v.angle_with(w, True)
-    print 'first_angle_rads: {}'.format(angle_degrees)
-    print '\r\n'
+    print('first_angle_rads: {}'.format(angle_degrees))
+    print('\r\n')
     
-    print '判断向量平行还是正交:'
+    print('判断向量平行还是正交:')
     v1 = Vector([-7.579, -7.88])
     w1 = Vector([22.737, 23.64])
     
@@ -259,39 +273,39 @@ if __name__ == '__main__':
     
     is_parallel = v1.is_parallel_to(w1)
     is_orthogonal = v1.is_orthogonal_to(w1)
-    print '1 parallel: {}, orthogonal: {}'.format(is_parallel, is_orthogonal)
+    print('1 parallel: {}, orthogonal: {}'.format(is_parallel, is_orthogonal))
 
     is_parallel = v2.is_parallel_to(w2)
     is_orthogonal = v2.is_orthogonal_to(w2)
-    print '2 parallel: {}, orthogonal: {}'.format(is_parallel, is_orthogonal)
+    print('2 parallel: {}, orthogonal: {}'.format(is_parallel, is_orthogonal))
 
     is_parallel = v3.is_parallel_to(w3)
     is_orthogonal = v3.is_orthogonal_to(w3)
-    print '3 parallel: {}, orthogonal: {}'.format(is_parallel, is_orthogonal)
+    print('3 parallel: {}, orthogonal: {}'.format(is_parallel, is_orthogonal))
 
     is_parallel = v4.is_parallel_to(w4)
     is_orthogonal = v4.is_orthogonal_to(w4)
-    print '4 parallel: {}, orthogonal: {}'.format(is_parallel, is_orthogonal)
-    print '\r\n'
+    print('4 parallel: {}, orthogonal: {}'.format(is_parallel, is_orthogonal))
+    print('\r\n')
     
-    print '计算投影:'
+    print('计算投影:')
     v = Vector([3.039, 1.879])
     w = Vector([0.825, 2.036])
-    print 'component_parallel_to: {}'.format(v.component_parallel_to(w))
+    print('component_parallel_to: {}'.format(v.component_parallel_to(w)))
 
     v = Vector([-9.88, -3.264, -8.159])
     w = Vector([-2.155, -9.353, -9.473])
-    print 'component_orthogonal_to: {}'.format(v.component_orthogonal_to(w))
+    print('component_orthogonal_to: {}'.format(v.component_orthogonal_to(w)))
  
     v = Vector([3.009, -6.172, 3.692, -2.51])
     w = Vector([6.404, -9.144, 2.759, 8.718])
     vpar = v.component_parallel_to(w)
     vort = v.component_orthogonal_to(w)
-    print 'parallel component:', vpar
-    print 'orthogonal component:', vort
-    print '\r\n'
+    print('parallel component:', vpar)
+    print('orthogonal component:', vort)
+    print('\r\n')
     
-    print '计算叉积:'
+    print('计算叉积:')
     v1 = Vector([8.462, 7.893, -8.187])
     w1 = Vector([6.984, -5.975, 4.778])
 
@@ -302,11 +316,11 @@ if __name__ == '__main__':
     w3 = Vector([-6.007, 0.124, 5.772])
 
     first_cross_product = v1.cross(w1)
-    print 'cross product is: {}'.format(first_cross_product)
+    print('cross product is: {}'.format(first_cross_product))
 
     area_parallelogram = v2.area_of_parallelogram_with(w2) 
-    print 'area parallelogram is: {}'.format(round(area_parallelogram, 3))
+    print('area parallelogram is: {}'.format(round(area_parallelogram, 3)))
 
     area_triangle = v3.area_of_triangle_with(w3)
-    print 'area triangle is: {}'.format(round(area_triangle, 3))
+    print('area triangle is: {}'.format(round(area_triangle, 3)))
    
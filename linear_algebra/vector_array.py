@@ -0,0 +1,124 @@
+# -*- coding:utf-8 -*-
+
+from decimal import Decimal
+
+from .vector import Vector
+from .buffers import float_memoryview, float_array, numpy_module, to_ndarray
+
+
+class VectorArray(object):
+    '''
+        同维向量的批量容器。
+        所有坐标按行优先顺序平铺在一段连续存储中，
+        第 i 个向量占据 [i*dimension, (i+1)*dimension)。
+
+        两种存储后端:
+          'decimal' -- Decimal 元组，与 Vector 的精度一致；
+          'float'   -- float64 缓冲区，由 from_buffer 不复制地包装
+                       NumPy 数组、array.array 等对象。
+    '''
+
+    DECIMAL_BACKEND = 'decimal'
+    FLOAT_BACKEND = 'float'
+
+    ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG = 'All vectors in the array should live in the same dimension'
+    BUFFER_SIZE_NOT_MULTIPLE_OF_DIM_MSG = 'The buffer size is not a multiple of the dimension'
+
+    def __init__(self, vectors):
+        try:
+            vectors = list(vectors)
+            if not vectors:
+                raise ValueError
+
+            d = len(vectors[0])
+            data = []
+            for v in vectors:
+                assert len(v) == d
+                data.extend([Decimal(x) for x in v])
+
+        except ValueError:
+            raise ValueError('The vectors must be nonempty')
+
+        except AssertionError:
+            raise Exception(self.ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
+
+        self._data = tuple(data)
+        self.dimension = d
+        self.backend = self.DECIMAL_BACKEND
+
+    # 不复制地包装 float64 缓冲区。二维缓冲区的列数即为维数；
+    # 一维缓冲区需给出 dimension
+    @classmethod
+    def from_buffer(cls, obj, dimension=None):
+        view, shape = float_memoryview(obj)
+
+        if dimension is None:
+            dimension = shape[-1] if len(shape) > 1 else len(view)
+        if dimension < 1 or len(view) == 0:
+            raise ValueError('The vectors must be nonempty')
+        if len(view) % dimension != 0:
+            raise ValueError(cls.BUFFER_SIZE_NOT_MULTIPLE_OF_DIM_MSG)
+
+        a = cls.__new__(cls)
+        a._data = view
+        a._owner = obj
+        a.dimension = dimension
+        a.backend = cls.FLOAT_BACKEND
+        return a
+
+    @classmethod
+    def from_array(cls, obj):
+        try:
+            return cls.from_buffer(obj)
+        except TypeError:
+            numpy = numpy_module()
+            return cls.from_buffer(numpy.ascontiguousarray(obj, dtype='d'))
+
+    def is_float(self):
+        return self.backend == self.FLOAT_BACKEND
+
+    def row(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('VectorArray index out of range')
+        d = self.dimension
+        return tuple(self._data[i*d:(i+1)*d])
+
+    def __len__(self):
+        return len(self._data) // self.dimension
+
+    def __getitem__(self, i):
+        return Vector(self.row(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    # 供 buffer_tolist 使用：按行展开，decimal 后端保留精度
+    def _tolist(self):
+        return [list(self.row(i)) for i in range(len(self))]
+
+    # float 后端直接返回共享内存的视图；decimal 后端需要复制一次
+    def __buffer__(self, flags):
+        if self.is_float():
+            return self._data
+        return memoryview(float_array(self._data))
+
+    def __array__(self, dtype=None, copy=None):
+        shape = (len(self), self.dimension)
+        if not self.is_float():
+            return to_ndarray(self._data, shape, dtype, copy)
+
+        numpy = numpy_module()
+        result = numpy.frombuffer(self._data, dtype='d').reshape(shape)
+        if copy:
+            result = result.copy()
+        if dtype is not None:
+            if copy is False and numpy.dtype(dtype) != result.dtype:
+                raise ValueError('Cannot convert the float buffer to {} without copying'.format(dtype))
+            result = result.astype(dtype, copy=False)
+        return result
+
+    def __str__(self):
+        return 'VectorArray: {} x {} ({})'.format(len(self), self.dimension, self.backend)